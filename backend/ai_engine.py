@@ -1,123 +1,585 @@
-from typing import List, Dict, Any
-from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import asyncio
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from itertools import compress
+from operator import attrgetter, itemgetter
 import json
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Query, Session
 from config import settings
 from models import BehaviorLog, PersonaProfile
 from ai_providers import ai_manager
 import re
 
+logger = logging.getLogger("mirrorme.ai")
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+POLITICAL_LABELS = ("left", "right", "neutral")
+
+# Per-label timeline columns, built once instead of formatted per data point
+POLITICAL_COLUMNS = {label: "political_" + label for label in POLITICAL_LABELS}
+SENTIMENT_COLUMNS = {label: "sentiment_" + label for label in SENTIMENT_LABELS}
+
+# Log subsets accumulated by PersonaAnalyzer._aggregate_logs
+LOG_BUCKETS = ("all", "twitter", "youtube", "search", "work", "personal")
+
+# behavior_type prefixes that place a log on a platform bucket
+PLATFORM_PREFIXES = (("tweet_", "twitter"), ("youtube_", "youtube"))
+
+# Hour-of-day windows used by the perceivers, as slices of a 24-slot histogram
+WORK_HOURS = slice(9, 18)  # 9 AM to 6 PM
+EVENING_HOURS = slice(18, 23)  # 6 PM to 11 PM
+
+# Platforms counted as social media activity
+SOCIAL_PLATFORMS = ("twitter", "instagram")
+
+# Topic groups summed by the recruiter, colleague, advertiser and data
+# broker perceivers
+PROFESSIONAL_TOPICS = ("technology", "career", "education", "finance")
+COLLEAGUE_WORK_TOPICS = ("technology", "career", "education")
+PURCHASE_TOPICS = ("technology", "health", "finance", "lifestyle")
+VALUABLE_TOPICS = ("finance", "health", "technology", "career")
+
+# Perception field holding each perceiver's headline score
+SCORE_KEYS = {
+    "advertiser": "targeting_value",
+    "content_feeder": "engagement_score",
+    "data_broker": "data_value",
+    "ai_system": "ai_confidence",
+    "recruiter": "hire_likelihood",
+    "romantic_partner": "compatibility_score",
+    "colleague": "collaboration_score",
+    "family_member": "family_harmony_score"
+}
+
+# Feedback prompt parts per perceiver: (request, (label, list field) sections,
+# assessment kind, focus points, closing tone)
+PERCEPTION_PROMPT_PARTS = {
+    "advertiser": (
+        "provide feedback on their advertising profile",
+        (("Valuable Signals", "valuable_signals"), ("Ad Resistance", "ad_resistance")),
+        "assessment",
+        ("How valuable this person is for targeted advertising",
+         "What types of ads would be most effective",
+         "Any challenges in reaching this audience"),
+        "Be analytical and marketing-focused."),
+    "content_feeder": (
+        "provide feedback on their content algorithm profile",
+        (("Engagement Drivers", "engagement_drivers"),
+         ("Algorithm Challenges", "algorithm_challenges")),
+        "assessment",
+        ("How predictable their content preferences are",
+         "What content recommendation strategies would work best",
+         "Any algorithmic challenges in serving relevant content"),
+        "Be technical and algorithm-focused."),
+    "data_broker": (
+        "provide feedback on their data broker profile",
+        (("Profitable Traits", "profitable_traits"), ("Data Gaps", "data_gaps")),
+        "assessment",
+        ("How valuable their data profile is for resale",
+         "What data points make them attractive to buyers",
+         "Any limitations in data collection or reliability"),
+        "Be business and data-focused."),
+    "ai_system": (
+        "provide feedback on their AI system profile",
+        (("AI Advantages", "ai_advantages"), ("AI Limitations", "ai_limitations")),
+        "assessment",
+        ("How well AI systems can model and predict their behavior",
+         "What makes them easy or difficult for AI to understand",
+         "Any data quality or pattern recognition challenges"),
+        "Be technical and AI-focused."),
+    "recruiter": (
+        "provide specific feedback on how they appear to potential employers",
+        (("Strengths", "strengths"), ("Concerns", "concerns"), ("Red Flags", "red_flags")),
+        "professional assessment",
+        ("What impression this person gives to recruiters",
+         "Specific suggestions for improving their professional online presence",
+         "Key strengths they should highlight more"),
+        "Be constructive and actionable."),
+    "romantic_partner": (
+        "provide feedback on how they appear to potential romantic partners",
+        (("Attractive Qualities", "attractive_qualities"),
+         ("Concerns", "potential_concerns"), ("Red Flags", "red_flags")),
+        "assessment",
+        ("What dating impression this person creates online",
+         "How to present themselves more attractively while staying authentic",
+         "Any behaviors that might be deterring potential partners"),
+        "Be respectful and helpful."),
+}
+
+# Fallback feedback per perceiver when no AI provider answers: texts for
+# scores >= 70, >= 50 and below
+FALLBACK_FEEDBACK = {
+    "advertiser": (
+        "Your digital behavior shows strong consumer signals that are highly valuable for targeted advertising. Your diverse interests and predictable patterns make you an attractive target for marketers.",
+        "Your online presence provides moderate value for advertisers. Consider diversifying your digital engagement to increase or decrease your advertising profile visibility.",
+        "Your digital behavior patterns show strong resistance to advertising targeting. Your privacy-conscious behavior and unpredictable patterns make you a challenging audience to reach."),
+    "content_feeder": (
+        "Your content consumption patterns are highly predictable, making you an ideal user for content recommendation algorithms. Your consistent preferences enable accurate content targeting.",
+        "Your content behavior is moderately predictable for recommendation algorithms. Some patterns are clear while others present targeting challenges for content systems.",
+        "Your content consumption patterns are unpredictable and challenging for recommendation algorithms. Your diverse and inconsistent preferences make content targeting difficult."),
+    "data_broker": (
+        "Your digital profile is highly valuable to data brokers due to rich behavioral patterns and valuable demographic signals. Your data would command premium prices in data markets.",
+        "Your digital profile has moderate value for data brokers. Some valuable signals are present but gaps limit the overall market value of your information.",
+        "Your digital profile has limited value for data brokers due to privacy-conscious behavior and fragmented data patterns. Your information would be difficult to monetize."),
+    "ai_system": (
+        "AI systems can model your behavior with high confidence due to consistent patterns and rich data. Your digital footprint enables accurate predictions and classifications.",
+        "AI systems have moderate confidence in modeling your behavior. Some patterns are clear while others present challenges for machine learning algorithms.",
+        "AI systems struggle to model your behavior due to inconsistent patterns or limited data. Your digital footprint presents significant challenges for algorithmic analysis."),
+    "recruiter": (
+        "Your professional online presence shows strong industry engagement and positive communication. Continue sharing expertise and professional insights to maintain this excellent impression.",
+        "Your online presence is professionally acceptable but could be enhanced. Consider sharing more industry insights and reducing personal content during work hours.",
+        "Your online presence may raise concerns for recruiters. Focus on professional content, avoid controversial topics, and showcase your expertise more prominently."),
+    "romantic_partner": (
+        "Your online presence suggests you're a positive, interesting person who would be an engaging partner. Your balanced interests and discrete approach to personal matters are attractive qualities.",
+        "Your online presence is generally appealing but could be more attractive to potential partners. Consider sharing more positive content and diverse interests while maintaining authenticity.",
+        "Your online behavior may not be creating the best impression for potential romantic partners. Focus on positive content, reduce controversial posts, and show your fun, creative side more."),
+}
+DEFAULT_FALLBACK_FEEDBACK = "Your online presence shows authentic engagement with diverse topics. Consider your audience when posting and maintain a balance between personal expression and public perception."
+
+# Score cut-offs and the overall_impression label for each band, lowest first
+IMPRESSION_THRESHOLDS = {
+    "recruiter": ((40, 60, 75), (
+        "concerning", "neutral", "positive", "very_positive")),
+    "romantic_partner": ((40, 60, 75), (
+        "concerning", "neutral", "attractive", "very_attractive")),
+    "colleague": ((40, 55, 70), (
+        "challenging_colleague", "neutral", "good_colleague", "excellent_colleague")),
+    "advertiser": ((40, 60, 75), (
+        "low_value", "neutral", "valuable", "high_value")),
+    "content_feeder": ((40, 60, 75), (
+        "unpredictable", "neutral", "targetable", "highly_predictable")),
+    "data_broker": ((40, 60, 75), (
+        "limited_value", "standard_profile", "valuable_data", "premium_profile")),
+    "ai_system": ((40, 65, 80), (
+        "low_confidence", "moderate_accuracy", "reliable_predictions", "high_confidence")),
+}
+
+# Content red flags checked by the recruiter and romantic perceivers,
+# matched against samples lowercased once per analysis
+RECRUITER_RED_FLAGS = re.compile("|".join(map(re.escape, (
+    "hate", "discriminat", "illegal", "fired", "lawsuit", "drunk", "party"))))
+ROMANTIC_RED_FLAGS = re.compile("|".join(map(re.escape, (
+    "ex-", "dating app", "hookup", "single", "breakup", "toxic", "cheating"))))
+
+# Content keyword sets counted over the samples for the romantic, family and
+# data broker perceivers; each alternation checks a sample in one regex pass
+CONTENT_KEYWORD_PATTERNS = {
+    name: re.compile("|".join(map(re.escape, keywords)))
+    for name, keywords in (
+        ("creative", ("art", "music", "creative", "design", "photography", "writing")),
+        ("concerning", ("party", "drunk", "wild", "inappropriate")),
+        ("shopping", ("buy", "purchase", "review", "price", "deal")),
+    )
+}
+
+# Content keyword set read by each perceiver that scans samples
+PERCEIVER_KEYWORD_SETS = {"romantic_partner": "creative",
+                          "family_member": "concerning", "data_broker": "shopping"}
+
+# BehaviorLog columns read per log by the in-memory aggregation
+COHORT_FIELDS = attrgetter("behavior_type", "sentiment", "political_tilt",
+                           "channel", "author")
+VIDEO_FIELD = attrgetter("video_id")
+KEYWORD_FIELDS = attrgetter("behavior_type", "keywords")
+TIMESTAMP_FIELD = attrgetter("timestamp")
+
+# The only BehaviorLog columns the timeline and topic bias analyses read;
+# selecting just these yields light Row tuples instead of full ORM objects
+TIMELINE_COLUMNS = (BehaviorLog.behavior_type, BehaviorLog.sentiment,
+                    BehaviorLog.political_tilt, BehaviorLog.timestamp,
+                    BehaviorLog.keywords)
+
+# Author URL fragments that place a log on the twitter bucket
+TWITTER_HOSTS = ("twitter.com", "x.com")
+
+# Exact behavior_types reported as their own platform in timeline analyses
+EXACT_PLATFORMS = {"search": "search", "engagement": "general_web"}
+
+# Exact behavior_types that place a log on an activity bucket
+ACTIVITY_BUCKETS = {"search": "search",
+                    "visit": "personal", "engagement": "personal"}
+
+# Keywords that mark a log as work-related for the professional avatar
+WORK_KEYWORDS = frozenset(
+    {"technology", "programming", "business", "career", "work"})
+
 
 class PersonaAnalyzer:
     """AI-powered persona analysis engine."""
 
+    _SUMMARY_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": "You are a thoughtful digital behavior analyst who creates respectful, insightful personality summaries."
+    }
+
+    _SUMMARY_PROMPT = """Based on the following digital behavior data, create a thoughtful persona summary:
+
+Top interests: {topics}
+Emotional tone: {sentiment}
+Total interactions: {total}
+
+Write a 2-3 sentence summary that captures this person's digital personality in a respectful, insightful way. Focus on their curiosity patterns and interests, not judgments.
+
+Example: "You appear to be someone with a strong curiosity about technology and health, often exploring topics with a balanced emotional approach. Your digital behavior suggests an analytical mindset with interests spanning both practical and creative domains."
+"""
+
+    _FEEDBACK_SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": "You are a thoughtful digital behavior analyst who provides constructive, actionable feedback on online presence."
+    }
+
+    # Feedback prompts put the fixed instructions first and the per-user data
+    # last, so repeat calls share a byte-identical prefix that provider-side
+    # prompt caching can reuse. Heads are filled once per perceiver from
+    # PERCEPTION_PROMPT_PARTS.
+    _PERCEPTION_PROMPT_HEAD = """Based on this person's digital behavior analysis below, {subject}.
+
+Write a 2-3 sentence {assessment} focusing on:
+{focus}
+
+{tone}
+
+"""
+
+    # Rendered once with the perceiver's sections; {{score}} and each list
+    # field stay placeholders for format_map at call time
+    _PERCEPTION_PROMPT_TAIL = """Score: {{score}}/100
+{sections}"""
+
+    _GENERAL_PERCEPTION_PROMPT = """Based on this person's digital behavior below, provide general feedback on their online presence.
+
+Write 2-3 sentences about how they come across online and suggestions for improvement.
+
+Score: {score}/100
+Overall impression: {impression}"""
+
     def __init__(self):
+        # Tuples, since the compiled topic patterns are built from these once
         self.topic_keywords = {
-            "technology": ["tech", "software", "programming", "ai", "computer", "app", "digital", "code"],
-            "health": ["health", "fitness", "medical", "wellness", "exercise", "nutrition", "mental"],
-            "finance": ["money", "investment", "crypto", "stock", "finance", "budget", "economy"],
-            "education": ["learn", "study", "course", "education", "tutorial", "knowledge", "skill"],
-            "entertainment": ["movie", "music", "game", "tv", "show", "entertainment", "fun"],
-            "news": ["news", "politics", "world", "current", "events", "breaking", "update"],
-            "lifestyle": ["fashion", "travel", "food", "home", "lifestyle", "culture", "art"],
-            "career": ["job", "career", "work", "professional", "business", "interview", "resume"]
+            "technology": ("tech", "software", "programming", "ai", "computer", "app", "digital", "code"),
+            "health": ("health", "fitness", "medical", "wellness", "exercise", "nutrition", "mental"),
+            "finance": ("money", "investment", "crypto", "stock", "finance", "budget", "economy"),
+            "education": ("learn", "study", "course", "education", "tutorial", "knowledge", "skill"),
+            "entertainment": ("movie", "music", "game", "tv", "show", "entertainment", "fun"),
+            "news": ("news", "politics", "world", "current", "events", "breaking", "update"),
+            "lifestyle": ("fashion", "travel", "food", "home", "lifestyle", "culture", "art"),
+            "career": ("job", "career", "work", "professional", "business", "interview", "resume")
         }
 
+        # One compiled alternation per topic so matching runs in the regex
+        # engine instead of a Python-level substring loop
+        self._topic_patterns = [
+            (topic, re.compile("|".join(re.escape(tk) for tk in topic_keywords)))
+            for topic, topic_keywords in self.topic_keywords.items()
+        ]
+        # Keywords repeat heavily across logs, so remember their topics
+        self._keyword_topics: Dict[str, Tuple[str, ...]] = {}
+        # Reverse index of the topic vocabulary itself; unlike the memo above
+        # it is never evicted, so exact tokens always resolve by dict lookup
+        self._vocabulary_topics: Dict[str, Tuple[str, ...]] = {}
+        for topic_keywords in self.topic_keywords.values():
+            for tk in topic_keywords:
+                self._vocabulary_topics[tk] = self._match_topics(tk)
+        # The behavior_type vocabulary is tiny, so classify each type once
+        self._behavior_buckets: Dict[str, Tuple[str, ...]] = {}
+        self._behavior_platforms: Dict[str, str] = {}
+
+        # Perceiver dispatch for generate_perception_analysis; unknown types
+        # fall back to the general perception
+        self._perceivers = {
+            "advertiser": self._generate_advertiser_perception,
+            "content_feeder": self._generate_content_feeder_perception,
+            "data_broker": self._generate_data_broker_perception,
+            "ai_system": self._generate_ai_system_perception,
+            # Legacy perceivers
+            "recruiter": self._generate_recruiter_perception,
+            "romantic_partner": self._generate_romantic_perception,
+            "colleague": self._generate_colleague_perception,
+            "family_member": self._generate_family_perception
+        }
+        # Feedback prompt template per perceiver: a static prefix identical
+        # across calls, then placeholders for the score and trait lists
+        self._perception_prompts = {
+            perceiver_type: self._PERCEPTION_PROMPT_HEAD.format(
+                subject=subject,
+                assessment=assessment,
+                focus="\n".join(f"{number}. {item}"
+                                 for number, item in enumerate(focus, 1)),
+                tone=tone) + self._PERCEPTION_PROMPT_TAIL.format(
+                sections="\n".join(f"{label}: {{{field}}}" for label, field in sections))
+            for perceiver_type, (subject, sections, assessment, focus, tone) in PERCEPTION_PROMPT_PARTS.items()
+        }
+
+    def _match_topics(self, keyword: str) -> Tuple[str, ...]:
+        """Return every topic matching a keyword, in topic_keywords order."""
+        topics = self._vocabulary_topics.get(keyword)
+        if topics is None:
+            topics = self._keyword_topics.get(keyword)
+        if topics is None:
+            keyword_lower = keyword.lower()
+            topics = tuple(topic for topic, pattern in self._topic_patterns
+                           if pattern.search(keyword_lower))
+            if len(self._keyword_topics) >= 10000:
+                self._keyword_topics.clear()
+            self._keyword_topics[keyword] = topics
+        return topics
+
     def extract_topics_from_keywords(self, keywords: List[str]) -> Dict[str, int]:
         """Extract topics from keywords using pattern matching."""
         topic_counts = Counter()
 
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            for topic, topic_keywords in self.topic_keywords.items():
-                if any(tk in keyword_lower for tk in topic_keywords):
-                    topic_counts[topic] += 1
+        # Count repeated keywords in C first, then match each distinct one once
+        for keyword, count in Counter(keywords).items():
+            for topic in self._match_topics(keyword):
+                topic_counts[topic] += count
 
         return dict(topic_counts)
 
-    def analyze_sentiment_distribution(self, behavior_logs: List[BehaviorLog]) -> Dict[str, float]:
-        """Analyze distribution of emotional sentiment in behavior logs."""
-        sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        total_with_sentiment = 0
+    def _classify_behavior(self, behavior_type: str) -> Tuple[str, ...]:
+        """Return the log buckets implied by a behavior_type alone."""
+        buckets = self._behavior_buckets.get(behavior_type)
+        if buckets is None:
+            buckets = tuple(platform for prefix, platform in PLATFORM_PREFIXES
+                            if behavior_type.startswith(prefix))
+            if behavior_type in ACTIVITY_BUCKETS:
+                buckets += (ACTIVITY_BUCKETS[behavior_type],)
+            self._behavior_buckets[behavior_type] = buckets
+        return buckets
+
+    def _new_log_bucket(self) -> Dict[str, Any]:
+        """Create an empty accumulator for one subset of behavior logs."""
+        # Label counters are seeded in label order so argmax ties stay stable
+        return {
+            "count": 0,
+            "behavior_types": Counter(),
+            # Logs per bucket implied by behavior_type alone (see _classify_behavior)
+            "type_buckets": Counter(),
+            "sentiment": Counter(dict.fromkeys(SENTIMENT_LABELS, 0)),
+            "political": Counter(dict.fromkeys(POLITICAL_LABELS, 0)),
+            "channels": Counter(),
+            "keywords": []
+        }
 
-        for log in behavior_logs:
-            if log.sentiment:
-                sentiment_counts[log.sentiment] += 1
-                total_with_sentiment += 1
+    def _aggregate_logs(self, behavior_logs: List[BehaviorLog]) -> Dict[str, Dict[str, Any]]:
+        """Collect every per-log counter the persona analysis needs.
+
+        The per-log work is attribute fetching and counting, both of which run
+        in C via attrgetter and Counter; Python code only touches each
+        distinct cohort.
+        """
+        raw_cohorts = Counter(zip(map(COHORT_FIELDS, behavior_logs),
+                                  map(bool, map(VIDEO_FIELD, behavior_logs))))
+        keyword_rows = list(map(KEYWORD_FIELDS, behavior_logs))
+
+        return self._build_aggregate(
+            self._author_cohorts(fields + (has_video, count)
+                                 for (fields, has_video), count in raw_cohorts.items()),
+            keyword_rows)
+
+    def _author_cohorts(self, author_rows: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str], bool, int]]
+                        ) -> List[Tuple[str, Optional[str], Optional[str], Optional[str], bool, bool, int]]:
+        """Replace the author in (behavior_type, sentiment, political_tilt,
+        channel, author, has_video, count) rows with the twitter-author flag,
+        merging rows that end up identical.
+
+        The flag is a case-sensitive substring test; authors repeat across
+        rows, so each distinct one is tested only once.
+        """
+        twitter_authors = {}
+        cohorts = Counter()
+        for behavior_type, sentiment, political_tilt, channel, author, has_video, count in author_rows:
+            if author not in twitter_authors:
+                author_text = str(author)
+                twitter_authors[author] = any(
+                    host in author_text for host in TWITTER_HOSTS)
+            cohorts[(behavior_type, sentiment, political_tilt, channel,
+                     twitter_authors[author], has_video)] += count
+
+        return [cohort + (count,) for cohort, count in cohorts.items()]
+
+    def _build_aggregate(self,
+                         cohorts: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str], bool, bool, int]],
+                         keyword_rows: Iterable[Tuple[str, List[str]]]) -> Dict[str, Dict[str, Any]]:
+        """Fold grouped log counts and keyword rows into per-subset buckets.
+
+        cohorts yields (behavior_type, sentiment, political_tilt, channel,
+        is_twitter_author, has_video, count) tuples, as produced by a GROUP BY;
+        keyword_rows yields (behavior_type, keywords) per log. Counters are
+        filled for the all/twitter/youtube/search/personal buckets, keywords
+        for the all/search/personal/work buckets.
+        """
+        aggregate = {name: self._new_log_bucket() for name in LOG_BUCKETS}
+        all_bucket = aggregate["all"]
+        work_bucket = aggregate["work"]
+
+        for behavior_type, sentiment, political_tilt, channel, is_twitter_author, has_video, count in cohorts:
+            type_names = names = self._classify_behavior(behavior_type)
+            if is_twitter_author and "twitter" not in names:
+                names += ("twitter",)
+            if has_video and "youtube" not in names:
+                names += ("youtube",)
+
+            buckets = [all_bucket]
+            buckets.extend(aggregate[name] for name in names)
+
+            for bucket in buckets:
+                bucket["count"] += count
+                bucket["behavior_types"][behavior_type] += count
+                for name in type_names:
+                    bucket["type_buckets"][name] += count
+                if sentiment:
+                    bucket["sentiment"][sentiment] += count
+                if political_tilt:
+                    bucket["political"][political_tilt] += count
+                if channel:
+                    bucket["channels"][channel] += count
+
+        for behavior_type, keywords in keyword_rows:
+            all_bucket["keywords"].extend(keywords)
+            activity = ACTIVITY_BUCKETS.get(behavior_type)
+            if activity:
+                aggregate[activity]["keywords"].extend(keywords)
+            if not WORK_KEYWORDS.isdisjoint(keywords):
+                work_bucket["count"] += 1
+                work_bucket["keywords"].extend(keywords)
+
+        return aggregate
+
+    def _aggregate_query(self, query: Query, keywords: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Aggregate a filtered BehaviorLog query, grouping counts in SQL.
+
+        Only behavior_type and keywords are pulled row by row; everything else
+        arrives as one row per distinct cohort. With keywords=False no rows are
+        pulled at all, and the keyword lists and work bucket stay empty.
+        """
+        has_video = and_(BehaviorLog.video_id.isnot(None),
+                         BehaviorLog.video_id != '')
+        cohort_rows = query.with_entities(
+            BehaviorLog.behavior_type,
+            BehaviorLog.sentiment,
+            BehaviorLog.political_tilt,
+            BehaviorLog.channel,
+            BehaviorLog.author,
+            case((has_video, True), else_=False).label("has_video")
+        ).subquery()
+
+        # Twitter authors are flagged in Python (see _author_cohorts): SQL LIKE
+        # is case-insensitive on SQLite, so a SQL test could match more logs
+        cohorts = self._author_cohorts(query.session.query(
+            *cohort_rows.c, func.count()).group_by(*cohort_rows.c))
+        # Keyword lists are the only per-row data left; stream them in batches
+        # (server-side cursor where supported) rather than buffering them all
+        keyword_rows = query.with_entities(
+            BehaviorLog.behavior_type, BehaviorLog.keywords).yield_per(1000) if keywords else ()
+
+        return self._build_aggregate(cohorts, keyword_rows)
+
+    def _distribution(self, counts: Dict[str, int], labels: Tuple[str, ...]) -> Dict[str, float]:
+        """Convert label counts into proportions, defaulting to neutral when empty."""
+        total = sum(counts.get(label, 0) for label in labels)
 
-        if total_with_sentiment == 0:
+        if total == 0:
             return {"neutral": 1.0}
 
-        # Convert to proportions
-        return {sentiment: count / total_with_sentiment
-                for sentiment, count in sentiment_counts.items()}
+        return {label: counts.get(label, 0) / total for label in labels}
+
+    def _argmax(self, values: Dict[str, float], default: str = "neutral") -> str:
+        """Return the key with the largest value, or default when nothing was counted."""
+        if not any(values.values()):
+            return default
+        return max(values, key=values.__getitem__)
+
+    def analyze_sentiment_distribution(self, behavior_logs: List[BehaviorLog]) -> Dict[str, float]:
+        """Analyze distribution of emotional sentiment in behavior logs."""
+        sentiment_counts = Counter(
+            filter(None, map(attrgetter("sentiment"), behavior_logs)))
+        return self._distribution(sentiment_counts, SENTIMENT_LABELS)
 
     def analyze_political_tilt_distribution(self, behavior_logs: List[BehaviorLog]) -> Dict[str, float]:
         """Analyze distribution of political tilt in behavior logs."""
-        political_counts = {"left": 0, "right": 0, "neutral": 0}
-        total_with_politics = 0
+        political_counts = Counter(
+            filter(None, map(attrgetter("political_tilt"), behavior_logs)))
+        return self._distribution(political_counts, POLITICAL_LABELS)
 
-        for log in behavior_logs:
-            if log.political_tilt:
-                political_counts[log.political_tilt] += 1
-                total_with_politics += 1
+    def analyze_platform_behavior(self, behavior_logs: List[BehaviorLog]) -> Dict[str, Any]:
+        """Analyze behavior patterns across different platforms."""
+        return self._summarize_platforms(self._aggregate_logs(behavior_logs))
 
-        if total_with_politics == 0:
-            return {"neutral": 1.0}
+    def analyze_enhanced_activity(self, query: Query) -> Dict[str, Any]:
+        """Summarize political tilt, sentiment, platforms and engagement for a log query."""
+        aggregate = self._aggregate_query(query, keywords=False)
+        activity = aggregate["all"]
+        behavior_types = activity["behavior_types"]
+
+        return {
+            "political_tilt": self._distribution(activity["political"], POLITICAL_LABELS),
+            "platform_behavior": self._summarize_platforms(aggregate),
+            "sentiment_distribution": self._distribution(activity["sentiment"], SENTIMENT_LABELS),
+            "engagement_patterns": {
+                "searches": behavior_types["search"],
+                "social_interactions": sum(count for behavior_type, count in behavior_types.items()
+                                           if behavior_type.startswith('tweet_')),
+                "video_consumption": sum(count for behavior_type, count in behavior_types.items()
+                                         if behavior_type.startswith('youtube_')),
+                "total_sessions": activity["count"]
+            },
+            "data_points": activity["count"]
+        }
 
-        # Convert to proportions
-        return {tilt: count / total_with_politics
-                for tilt, count in political_counts.items()}
+    def analyze_digital_avatars(self, query: Query) -> Dict[str, Any]:
+        """Build digital avatars for a log query from SQL-grouped counts."""
+        aggregate = self._aggregate_query(query)
+        platform_analysis = self._summarize_platforms(aggregate)
 
-    def analyze_platform_behavior(self, behavior_logs: List[BehaviorLog]) -> Dict[str, Any]:
-        """Analyze behavior patterns across different platforms."""
+        return {
+            "digital_avatars": self._build_digital_avatars(aggregate, platform_analysis),
+            "data_points": aggregate["all"]["count"]
+        }
+
+    def _summarize_platforms(self, aggregate: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build per-platform statistics from pre-aggregated log buckets."""
         platform_stats = {}
 
         # Twitter/X behavior analysis
-        twitter_logs = [log for log in behavior_logs if 'twitter.com' in str(
-            log.author) or 'x.com' in str(log.author) or log.behavior_type.startswith('tweet_')]
-        if twitter_logs:
-            twitter_sentiment = self.analyze_sentiment_distribution(
-                twitter_logs)
-            twitter_politics = self.analyze_political_tilt_distribution(
-                twitter_logs)
+        twitter = aggregate["twitter"]
+        if twitter["count"]:
+            engagement = twitter["behavior_types"]
             platform_stats['twitter'] = {
-                'total_interactions': len(twitter_logs),
-                'sentiment_distribution': twitter_sentiment,
-                'political_distribution': twitter_politics,
+                'total_interactions': twitter["count"],
+                'sentiment_distribution': self._distribution(twitter["sentiment"], SENTIMENT_LABELS),
+                'political_distribution': self._distribution(twitter["political"], POLITICAL_LABELS),
                 'engagement_types': {
-                    'views': len([log for log in twitter_logs if log.behavior_type == 'tweet_view']),
-                    'likes': len([log for log in twitter_logs if log.behavior_type == 'tweet_like']),
-                    'retweets': len([log for log in twitter_logs if log.behavior_type == 'tweet_retweet']),
-                    'compositions': len([log for log in twitter_logs if log.behavior_type == 'tweet_compose'])
+                    'views': engagement['tweet_view'],
+                    'likes': engagement['tweet_like'],
+                    'retweets': engagement['tweet_retweet'],
+                    'compositions': engagement['tweet_compose']
                 }
             }
 
         # YouTube behavior analysis
-        youtube_logs = [log for log in behavior_logs if log.behavior_type.startswith(
-            'youtube_') or log.video_id]
-        if youtube_logs:
-            youtube_sentiment = self.analyze_sentiment_distribution(
-                youtube_logs)
-            youtube_politics = self.analyze_political_tilt_distribution(
-                youtube_logs)
-
-            # Analyze top channels
-            channel_counts = {}
-            for log in youtube_logs:
-                if log.channel:
-                    channel_counts[log.channel] = channel_counts.get(
-                        log.channel, 0) + 1
+        youtube = aggregate["youtube"]
+        if youtube["count"]:
+            engagement = youtube["behavior_types"]
+            channel_counts = youtube["channels"]
 
             platform_stats['youtube'] = {
-                'total_interactions': len(youtube_logs),
-                'sentiment_distribution': youtube_sentiment,
-                'political_distribution': youtube_politics,
-                'top_channels': sorted(channel_counts.items(), key=lambda x: x[1], reverse=True)[:5],
+                'total_interactions': youtube["count"],
+                'sentiment_distribution': self._distribution(youtube["sentiment"], SENTIMENT_LABELS),
+                'political_distribution': self._distribution(youtube["political"], POLITICAL_LABELS),
+                'top_channels': channel_counts.most_common(5),
                 'engagement_types': {
-                    'video_watches': len([log for log in youtube_logs if log.behavior_type == 'youtube_video_watch']),
-                    'comment_views': len([log for log in youtube_logs if log.behavior_type == 'youtube_comment_view'])
+                    'video_watches': engagement['youtube_video_watch'],
+                    'comment_views': engagement['youtube_comment_view']
                 }
             }
 
@@ -153,43 +615,30 @@ class PersonaAnalyzer:
                                        behavior_patterns: Dict[str, Any]) -> str:
         """Generate natural language persona summary using available AI providers."""
 
-        # Prepare context for AI
-        context = {
-            "top_topics": list(topic_counts.keys())[:5],
-            "sentiment": sentiment_dist,
-            "total_interactions": sum(topic_counts.values()),
-            "patterns": behavior_patterns
-        }
-
-        prompt = f"""Based on the following digital behavior data, create a thoughtful persona summary:
-
-Top interests: {', '.join(context['top_topics'])}
-Emotional tone: {context['sentiment']}
-Total interactions: {context['total_interactions']}
-
-Write a 2-3 sentence summary that captures this person's digital personality in a respectful, insightful way. Focus on their curiosity patterns and interests, not judgments.
-
-Example: "You appear to be someone with a strong curiosity about technology and health, often exploring topics with a balanced emotional approach. Your digital behavior suggests an analytical mindset with interests spanning both practical and creative domains."
-"""
+        # Prepare context for AI, ranking topics by interaction count
+        top_topics = [topic for topic, _ in Counter(topic_counts).most_common(5)]
+        prompt = self._SUMMARY_PROMPT.format(
+            topics=', '.join(top_topics),
+            sentiment=sentiment_dist,
+            total=sum(topic_counts.values()))
 
         messages = [
-            {"role": "system", "content": "You are a thoughtful digital behavior analyst who creates respectful, insightful personality summaries."},
+            self._SUMMARY_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt}
         ]
 
         try:
             result, provider_used = await ai_manager.generate_text(messages, max_tokens=150)
-            print(f"Generated summary using {provider_used}")
+            logger.debug("Generated summary using %s", provider_used)
             return result
         except Exception as e:
-            print(f"All AI providers failed: {e}")
+            logger.warning("All AI providers failed: %s", e)
             return self._generate_fallback_summary(topic_counts, sentiment_dist)
 
     def _generate_fallback_summary(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float]) -> str:
         """Generate a basic summary without AI when all providers are unavailable."""
         top_topics = list(topic_counts.keys())[:3]
-        dominant_sentiment = max(sentiment_dist.items(), key=lambda x: x[1])[
-            0] if sentiment_dist else "balanced"
+        dominant_sentiment = self._argmax(sentiment_dist, "balanced")
 
         if len(top_topics) >= 2:
             return f"Your digital behavior shows strong interests in {top_topics[0]} and {top_topics[1]}, with a generally {dominant_sentiment} approach to online exploration. You demonstrate curiosity across multiple domains."
@@ -204,6 +653,15 @@ Example: "You appear to be someone with a strong curiosity about technology and
                                    political_dist: Dict[str, float],
                                    behavior_logs: List[BehaviorLog]) -> List[str]:
         """Extract personality traits from behavior patterns with enhanced analysis."""
+        return self._personality_traits(
+            topic_counts, sentiment_dist, political_dist, self._aggregate_logs(behavior_logs)["all"])
+
+    def _personality_traits(self,
+                            topic_counts: Dict[str, int],
+                            sentiment_dist: Dict[str, float],
+                            political_dist: Dict[str, float],
+                            activity: Dict[str, Any]) -> List[str]:
+        """Extract personality traits using the aggregated activity bucket."""
         traits = []
 
         # Analyze topic diversity
@@ -231,44 +689,33 @@ Example: "You appear to be someone with a strong curiosity about technology and
             traits.append("learning-oriented")
 
         # Analyze behavior patterns
-        search_logs = [
-            log for log in behavior_logs if log.behavior_type == "search"]
-        if len(search_logs) > len(behavior_logs) * 0.7:
+        behavior_types = activity["behavior_types"]
+        if behavior_types["search"] > activity["count"] * 0.7:
             traits.append("research-oriented")
 
         # Analyze social media engagement
-        social_logs = [
-            log for log in behavior_logs if log.behavior_type.startswith('tweet_')]
-        if len(social_logs) > len(behavior_logs) * 0.3:
+        if activity["type_buckets"]["twitter"] > activity["count"] * 0.3:
             traits.append("social-media-active")
 
-        return list(set(traits))  # Remove duplicates
+        # Every rule appends a distinct trait, so rule order is kept as-is
+        return traits
 
     def generate_digital_avatars(self, behavior_logs: List[BehaviorLog], platform_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate top 5 digital avatars representing different versions of the user across platforms."""
+        return self._build_digital_avatars(self._aggregate_logs(behavior_logs), platform_analysis)
+
+    def _build_digital_avatars(self, aggregate: Dict[str, Dict[str, Any]], platform_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate digital avatars from pre-aggregated log buckets."""
         avatars = []
+        total_logs = aggregate["all"]["count"]
 
         # Avatar 1: Search Persona (based on search behavior)
-        search_logs = [
-            log for log in behavior_logs if log.behavior_type == "search"]
-        if search_logs:
-            search_keywords = []
-            search_politics = {"left": 0, "right": 0, "neutral": 0}
-            search_sentiment = {"positive": 0, "negative": 0, "neutral": 0}
-
-            for log in search_logs:
-                search_keywords.extend(log.keywords)
-                if log.political_tilt:
-                    search_politics[log.political_tilt] += 1
-                if log.sentiment:
-                    search_sentiment[log.sentiment] += 1
-
+        search = aggregate["search"]
+        if search["count"]:
             top_search_topics = self.extract_topics_from_keywords(
-                search_keywords)
-            dominant_politics = max(search_politics, key=search_politics.get) if any(
-                search_politics.values()) else "neutral"
-            dominant_sentiment = max(search_sentiment, key=search_sentiment.get) if any(
-                search_sentiment.values()) else "neutral"
+                search["keywords"])
+            dominant_politics = self._argmax(search["political"])
+            dominant_sentiment = self._argmax(search["sentiment"])
 
             search_avatar = {
                 "name": "The Searcher",
@@ -279,33 +726,29 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "top_interests": list(top_search_topics.keys())[:3],
                 "political_lean": dominant_politics,
                 "emotional_tone": dominant_sentiment,
-                "behavior_pattern": f"Searches {len(search_logs)} times, focuses on {list(top_search_topics.keys())[0] if top_search_topics else 'various topics'}",
-                "strength": len(search_logs) / len(behavior_logs) if behavior_logs else 0
+                "behavior_pattern": f"Searches {search['count']} times, focuses on {list(top_search_topics.keys())[0] if top_search_topics else 'various topics'}",
+                "strength": search["count"] / total_logs if total_logs else 0
             }
             avatars.append(search_avatar)
 
         # Avatar 2: Social Media Persona (Twitter/X)
         if 'twitter' in platform_analysis:
             twitter_data = platform_analysis['twitter']
-            twitter_logs = [
-                log for log in behavior_logs if log.behavior_type.startswith('tweet_')]
+            twitter_count = aggregate["all"]["type_buckets"]["twitter"]
 
+            engagement = twitter_data['engagement_types']
             social_personality = []
-            if twitter_data['engagement_types']['likes'] > twitter_data['engagement_types']['views'] * 0.1:
+            if engagement['likes'] > engagement['views'] * 0.1:
                 social_personality.append("highly-engaged")
-            if twitter_data['engagement_types']['retweets'] > 0:
+            if engagement['retweets'] > 0:
                 social_personality.append("content-amplifier")
-            if twitter_data['engagement_types']['compositions'] > 0:
+            if engagement['compositions'] > 0:
                 social_personality.append("content-creator")
 
-            dominant_social_politics = "neutral"
-            dominant_social_sentiment = "neutral"
-            if twitter_data.get('political_distribution'):
-                dominant_social_politics = max(
-                    twitter_data['political_distribution'], key=twitter_data['political_distribution'].get)
-            if twitter_data.get('sentiment_distribution'):
-                dominant_social_sentiment = max(
-                    twitter_data['sentiment_distribution'], key=twitter_data['sentiment_distribution'].get)
+            dominant_social_politics = self._argmax(
+                twitter_data.get('political_distribution', {}))
+            dominant_social_sentiment = self._argmax(
+                twitter_data.get('sentiment_distribution', {}))
 
             social_avatar = {
                 "name": "The Social Connector",
@@ -316,16 +759,15 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "top_interests": ["social-trends", "current-events", "discussions"],
                 "political_lean": dominant_social_politics,
                 "emotional_tone": dominant_social_sentiment,
-                "behavior_pattern": f"{twitter_data['engagement_types']['likes']} likes, {twitter_data['engagement_types']['retweets']} retweets",
-                "strength": len(twitter_logs) / len(behavior_logs) if behavior_logs else 0
+                "behavior_pattern": f"{engagement['likes']} likes, {engagement['retweets']} retweets",
+                "strength": twitter_count / total_logs if total_logs else 0
             }
             avatars.append(social_avatar)
 
         # Avatar 3: Entertainment Consumer (YouTube)
         if 'youtube' in platform_analysis:
             youtube_data = platform_analysis['youtube']
-            youtube_logs = [
-                log for log in behavior_logs if log.behavior_type.startswith('youtube_')]
+            youtube_count = aggregate["all"]["type_buckets"]["youtube"]
 
             entertainment_personality = ["entertainment-focused"]
             if youtube_data.get('top_channels') and len(youtube_data['top_channels']) > 3:
@@ -333,14 +775,10 @@ Example: "You appear to be someone with a strong curiosity about technology and
             if youtube_data['engagement_types'].get('comment_views', 0) > 0:
                 entertainment_personality.append("community-engaged")
 
-            dominant_yt_politics = "neutral"
-            dominant_yt_sentiment = "neutral"
-            if youtube_data.get('political_distribution'):
-                dominant_yt_politics = max(
-                    youtube_data['political_distribution'], key=youtube_data['political_distribution'].get)
-            if youtube_data.get('sentiment_distribution'):
-                dominant_yt_sentiment = max(
-                    youtube_data['sentiment_distribution'], key=youtube_data['sentiment_distribution'].get)
+            dominant_yt_politics = self._argmax(
+                youtube_data.get('political_distribution', {}))
+            dominant_yt_sentiment = self._argmax(
+                youtube_data.get('sentiment_distribution', {}))
 
             top_channel = youtube_data['top_channels'][0][0] if youtube_data.get(
                 'top_channels') else "Various creators"
@@ -355,19 +793,14 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "political_lean": dominant_yt_politics,
                 "emotional_tone": dominant_yt_sentiment,
                 "behavior_pattern": f"Watches videos, top channel: {top_channel}",
-                "strength": len(youtube_logs) / len(behavior_logs) if behavior_logs else 0
+                "strength": youtube_count / total_logs if total_logs else 0
             }
             avatars.append(entertainment_avatar)
 
         # Avatar 4: Professional Self (based on work-related searches and tech content)
-        work_logs = [log for log in behavior_logs if any(keyword in ['technology', 'programming', 'business', 'career', 'work']
-                                                         for keyword in log.keywords)]
-        if work_logs:
-            work_keywords = []
-            for log in work_logs:
-                work_keywords.extend(log.keywords)
-
-            work_topics = self.extract_topics_from_keywords(work_keywords)
+        work = aggregate["work"]
+        if work["count"]:
+            work_topics = self.extract_topics_from_keywords(work["keywords"])
             professional_avatar = {
                 "name": "The Professional",
                 "description": "Your career-focused identity that seeks growth and knowledge",
@@ -378,17 +811,14 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "political_lean": "neutral",
                 "emotional_tone": "positive",
                 "behavior_pattern": f"Focuses on {list(work_topics.keys())[0] if work_topics else 'professional growth'}",
-                "strength": len(work_logs) / len(behavior_logs) if behavior_logs else 0
+                "strength": work["count"] / total_logs if total_logs else 0
             }
             avatars.append(professional_avatar)
 
         # Avatar 5: Personal Explorer (based on diverse interests and general browsing)
-        personal_logs = [
-            log for log in behavior_logs if log.behavior_type in ["visit", "engagement"]]
-        if personal_logs:
-            personal_keywords = []
-            for log in personal_logs:
-                personal_keywords.extend(log.keywords)
+        personal = aggregate["personal"]
+        if personal["count"]:
+            personal_keywords = personal["keywords"]
 
             personal_topics = self.extract_topics_from_keywords(
                 personal_keywords)
@@ -411,7 +841,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "political_lean": "balanced",
                 "emotional_tone": "curious",
                 "behavior_pattern": f"Explores {len(personal_topics)} different topics broadly",
-                "strength": len(personal_logs) / len(behavior_logs) if behavior_logs else 0
+                "strength": personal["count"] / total_logs if total_logs else 0
             }
             avatars.append(personal_avatar)
 
@@ -427,7 +857,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
         """Perform complete persona analysis for a user."""
 
         # Get behavior logs from specified time period
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
 
         query = db.query(BehaviorLog).filter(
             BehaviorLog.user_id == user_id,
@@ -438,9 +868,12 @@ Example: "You appear to be someone with a strong curiosity about technology and
         if not include_sensitive:
             query = query.filter(BehaviorLog.is_sensitive == False)
 
-        behavior_logs = query.all()
+        # Group counts in the database and stream only the keyword columns;
+        # the session blocks, so it runs off the event loop
+        aggregate = await asyncio.to_thread(self._aggregate_query, query)
+        activity = aggregate["all"]
 
-        if not behavior_logs:
+        if not activity["count"]:
             return {
                 "persona_summary": "No behavior data available for analysis. Start browsing with the extension or log some sample behaviors to generate insights.",
                 "top_topics": [],
@@ -453,34 +886,30 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "data_points_analyzed": 0
             }
 
-        # Extract all keywords from behavior logs
-        all_keywords = []
-        for log in behavior_logs:
-            all_keywords.extend(log.keywords)
-
         # Perform analysis
-        topic_counts = self.extract_topics_from_keywords(all_keywords)
-        sentiment_dist = self.analyze_sentiment_distribution(behavior_logs)
-        political_dist = self.analyze_political_tilt_distribution(
-            behavior_logs)
-        personality_traits = self.extract_personality_traits(
-            topic_counts, sentiment_dist, political_dist, behavior_logs
+        topic_counts = self.extract_topics_from_keywords(activity["keywords"])
+        sentiment_dist = self._distribution(
+            activity["sentiment"], SENTIMENT_LABELS)
+        political_dist = self._distribution(
+            activity["political"], POLITICAL_LABELS)
+        personality_traits = self._personality_traits(
+            topic_counts, sentiment_dist, political_dist, activity
         )
 
         # Build interest network
         interest_map = self.build_interest_network(topic_counts)
 
         # Analyze platform behavior
-        platform_analysis = self.analyze_platform_behavior(behavior_logs)
+        platform_analysis = self._summarize_platforms(aggregate)
 
         # Generate digital avatars
-        digital_avatars = self.generate_digital_avatars(
-            behavior_logs, platform_analysis)
+        digital_avatars = self._build_digital_avatars(
+            aggregate, platform_analysis)
 
         # Generate AI summary with enhanced data
         persona_summary = await self.generate_persona_summary(
             topic_counts, sentiment_dist, {
-                "total_logs": len(behavior_logs),
+                "total_logs": activity["count"],
                 "political_distribution": political_dist,
                 "platform_analysis": platform_analysis,
                 "digital_avatars": digital_avatars
@@ -489,7 +918,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
 
         # Generate insights
         insights = self._generate_insights(
-            topic_counts, sentiment_dist, political_dist, behavior_logs, platform_analysis)
+            topic_counts, sentiment_dist, political_dist, activity, platform_analysis)
 
         return {
             "persona_summary": persona_summary,
@@ -501,14 +930,14 @@ Example: "You appear to be someone with a strong curiosity about technology and
             "digital_avatars": digital_avatars,
             "interest_map": interest_map,
             "insights": insights,
-            "data_points_analyzed": len(behavior_logs)
+            "data_points_analyzed": activity["count"]
         }
 
     def _generate_insights(self,
                            topic_counts: Dict[str, int],
                            sentiment_dist: Dict[str, float],
                            political_dist: Dict[str, float],
-                           behavior_logs: List[BehaviorLog],
+                           activity: Dict[str, Any],
                            platform_analysis: Dict[str, Any]) -> List[str]:
         """Generate enhanced behavioral insights with political and platform analysis."""
         insights = []
@@ -540,11 +969,11 @@ Example: "You appear to be someone with a strong curiosity about technology and
 
         # Platform-specific insights
         if 'twitter' in platform_analysis:
-            twitter_data = platform_analysis['twitter']
-            if twitter_data['engagement_types']['likes'] > twitter_data['engagement_types']['views'] * 0.1:
+            engagement = platform_analysis['twitter']['engagement_types']
+            if engagement['likes'] > engagement['views'] * 0.1:
                 insights.append(
                     "You're an active Twitter engager who likes content frequently")
-            if twitter_data['engagement_types']['retweets'] > 0:
+            if engagement['retweets'] > 0:
                 insights.append(
                     "You amplify content through retweets, showing influence behavior")
 
@@ -563,110 +992,95 @@ Example: "You appear to be someone with a strong curiosity about technology and
             insights.append("You have focused, specialized interests")
 
         # Activity patterns
-        search_ratio = len([log for log in behavior_logs if log.behavior_type == "search"]) / len(
-            behavior_logs) if behavior_logs else 0
+        total_logs = activity["count"]
+        search_ratio = activity["behavior_types"]["search"] / \
+            total_logs if total_logs else 0
         if search_ratio > 0.6:
             insights.append(
                 "You're a research-oriented user who actively searches for information")
 
         # Social media activity patterns
-        social_ratio = len([log for log in behavior_logs if log.behavior_type.startswith('tweet_')]) / len(
-            behavior_logs) if behavior_logs else 0
+        social_ratio = activity["type_buckets"]["twitter"] / \
+            total_logs if total_logs else 0
         if social_ratio > 0.3:
             insights.append(
                 "You're highly active on social media platforms")
 
         return insights
 
-    def analyze_algorithm_influence_timeline(self, behavior_logs: List[BehaviorLog], days_back: int = 30) -> Dict[str, Any]:
-        """Analyze how algorithms may be influencing user behavior over time."""
-        from datetime import datetime, timedelta
-
-        # Group behavior logs by day for timeline analysis
-        timeline_data = {}
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-
-        # Filter logs to the specified time period
-        recent_logs = [
-            log for log in behavior_logs if log.timestamp >= cutoff_date]
+    def _recent_logs(self, behavior_logs: List[BehaviorLog], days_back: int) -> List[BehaviorLog]:
+        """Return logs from the last days_back days.
 
-        # Group by day
-        for log in recent_logs:
-            day_key = log.timestamp.strftime('%Y-%m-%d')
-            if day_key not in timeline_data:
-                timeline_data[day_key] = {
-                    'political_left': 0,
-                    'political_right': 0,
-                    'political_neutral': 0,
-                    'sentiment_positive': 0,
-                    'sentiment_negative': 0,
-                    'sentiment_neutral': 0,
-                    'total_interactions': 0,
-                    'platform_distribution': {},
-                    'topic_distribution': {}
-                }
-
-            day_data = timeline_data[day_key]
-            day_data['total_interactions'] += 1
-
-            # Track political tilt over time
-            if log.political_tilt:
-                day_data[f'political_{log.political_tilt}'] += 1
+        SQLite hands back naive UTC timestamps while PostgreSQL returns aware
+        ones, so the cutoff takes whichever form the result set carries.
+        """
+        if not behavior_logs:
+            return []
 
-            # Track sentiment over time
-            if log.sentiment:
-                day_data[f'sentiment_{log.sentiment}'] += 1
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+        if behavior_logs[0].timestamp.tzinfo is None:
+            cutoff_date = cutoff_date.replace(tzinfo=None)
 
-            # Track platform behavior
-            platform_key = self._get_platform_from_log(log)
-            if platform_key:
-                day_data['platform_distribution'][platform_key] = day_data['platform_distribution'].get(
-                    platform_key, 0) + 1
+        # Logs arrive unordered, so no bisect; compress/map still keep the
+        # per-log comparison out of the interpreter loop
+        return list(compress(behavior_logs, map(
+            cutoff_date.__le__, map(TIMESTAMP_FIELD, behavior_logs))))
 
-            # Track topic trends
-            for keyword in log.keywords:
-                for topic, topic_keywords in self.topic_keywords.items():
-                    if any(tk in keyword.lower() for tk in topic_keywords):
-                        day_data['topic_distribution'][topic] = day_data['topic_distribution'].get(
-                            topic, 0) + 1
-                        break
+    def analyze_algorithm_influence_timeline(self, behavior_logs: List[BehaviorLog], days_back: int = 30) -> Dict[str, Any]:
+        """Analyze how algorithms may be influencing user behavior over time."""
+        # Filter logs to the specified time period
+        recent_logs = self._recent_logs(behavior_logs, days_back)
+
+        # Group by day: tally (day, value) pairs column by column so each
+        # Counter acts as a day x value pivot table built in C
+        days = [log.timestamp.date() for log in recent_logs]
+        day_totals = Counter(days)
+        political_counts = Counter(
+            zip(days, map(attrgetter("political_tilt"), recent_logs)))
+        sentiment_counts = Counter(
+            zip(days, map(attrgetter("sentiment"), recent_logs)))
+        type_counts = Counter(
+            zip(days, map(attrgetter("behavior_type"), recent_logs)))
+        topic_counts = Counter(
+            (day, topics[0])
+            for day, log in zip(days, recent_logs)
+            for topics in map(self._match_topics, log.keywords) if topics)
+
+        # Platforms follow from behavior_type, so fold the (day, type) cells
+        # instead of classifying every log
+        platform_by_day = {day: Counter() for day in day_totals}
+        for (day, behavior_type), count in type_counts.items():
+            platform_by_day[day][self._platform_for_type(behavior_type)] += count
+        topic_by_day = {day: {} for day in day_totals}
+        for (day, topic), count in topic_counts.items():
+            topic_by_day[day][topic] = count
 
         # Convert to timeline format and calculate trends
         timeline_points = []
         political_trend = []
         sentiment_trend = []
 
-        for day, data in sorted(timeline_data.items()):
-            if data['total_interactions'] > 0:
-                # Calculate proportions for this day
-                political_left_pct = (
-                    data['political_left'] / data['total_interactions']) * 100
-                political_right_pct = (
-                    data['political_right'] / data['total_interactions']) * 100
-                sentiment_positive_pct = (
-                    data['sentiment_positive'] / data['total_interactions']) * 100
-                sentiment_negative_pct = (
-                    data['sentiment_negative'] / data['total_interactions']) * 100
-
-                timeline_points.append({
-                    'date': day,
-                    'political_left': political_left_pct,
-                    'political_right': political_right_pct,
-                    'political_neutral': (data['political_neutral'] / data['total_interactions']) * 100,
-                    'sentiment_positive': sentiment_positive_pct,
-                    'sentiment_negative': sentiment_negative_pct,
-                    'sentiment_neutral': (data['sentiment_neutral'] / data['total_interactions']) * 100,
-                    'total_interactions': data['total_interactions'],
-                    'platform_distribution': data['platform_distribution'],
-                    'topic_distribution': data['topic_distribution']
-                })
-
-                # Positive = left lean, negative = right lean
-                political_trend.append(
-                    political_left_pct - political_right_pct)
-                # Positive = positive sentiment dominance
-                sentiment_trend.append(
-                    sentiment_positive_pct - sentiment_negative_pct)
+        for day in sorted(day_totals):
+            total_interactions = day_totals[day]
+
+            # Calculate proportions for this day, dividing only once
+            scale = 100 / total_interactions
+            point = {'date': day.isoformat()}
+            for label, column in POLITICAL_COLUMNS.items():
+                point[column] = political_counts[(day, label)] * scale
+            for label, column in SENTIMENT_COLUMNS.items():
+                point[column] = sentiment_counts[(day, label)] * scale
+            point['total_interactions'] = total_interactions
+            point['platform_distribution'] = platform_by_day[day]
+            point['topic_distribution'] = topic_by_day[day]
+            timeline_points.append(point)
+
+            # Positive = left lean, negative = right lean
+            political_trend.append(
+                point['political_left'] - point['political_right'])
+            # Positive = positive sentiment dominance
+            sentiment_trend.append(
+                point['sentiment_positive'] - point['sentiment_negative'])
 
         # Detect trends and algorithmic influence patterns
         algorithm_influence = self._detect_algorithmic_influence(
@@ -683,18 +1097,27 @@ Example: "You appear to be someone with a strong curiosity about technology and
 
     def _get_platform_from_log(self, log: BehaviorLog) -> str:
         """Extract platform name from behavior log."""
-        if log.behavior_type.startswith('tweet_'):
-            return 'twitter'
-        elif log.behavior_type.startswith('youtube_'):
-            return 'youtube'
-        elif log.behavior_type == 'search':
-            return 'search'
-        elif log.behavior_type == 'engagement':
-            return 'general_web'
-        else:
-            return 'other'
-
-    def _detect_algorithmic_influence(self, timeline_points: List[Dict], political_trend: List[float], sentiment_trend: List[float]) -> Dict[str, Any]:
+        return self._platform_for_type(log.behavior_type)
+
+    def _platform_for_type(self, behavior_type: str) -> str:
+        """Map a behavior_type to its platform name."""
+        platform = self._behavior_platforms.get(behavior_type)
+        if platform is None:
+            platform = next((name for prefix, name in PLATFORM_PREFIXES
+                             if behavior_type.startswith(prefix)),
+                            EXACT_PLATFORMS.get(behavior_type, 'other'))
+            self._behavior_platforms[behavior_type] = platform
+        return platform
+
+    def _mean(self, values: List[float]) -> float:
+        """Arithmetic mean of a non-empty trend window."""
+        return sum(values) / len(values)
+
+    def _spread(self, values: List[float]) -> float:
+        """Range (max - min) of a non-empty trend window."""
+        return max(values) - min(values)
+
+    def _detect_algorithmic_influence(self, timeline_points: List[Dict[str, Any]], political_trend: List[float], sentiment_trend: List[float]) -> Dict[str, Any]:
         """Detect patterns that suggest algorithmic influence or bias reinforcement."""
         influence_patterns = {
             'bias_reinforcement_detected': False,
@@ -714,10 +1137,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
             political_trend) >= 14 else political_trend[:len(political_trend)//2]
 
         if len(recent_political) >= 3 and len(early_political) >= 3:
-            recent_avg = sum(recent_political) / len(recent_political)
-            early_avg = sum(early_political) / len(early_political)
-
-            polarization_change = abs(recent_avg) - abs(early_avg)
+            polarization_change = abs(self._mean(recent_political)) - \
+                abs(self._mean(early_political))
 
             if polarization_change > 10:  # 10% increase in political lean
                 influence_patterns['bias_reinforcement_detected'] = True
@@ -731,21 +1152,32 @@ Example: "You appear to be someone with a strong curiosity about technology and
         # Detect sentiment manipulation patterns
         recent_sentiment = sentiment_trend[-7:]
         if len(recent_sentiment) >= 3:
-            sentiment_volatility = max(
-                recent_sentiment) - min(recent_sentiment)
+            sentiment_volatility = self._spread(recent_sentiment)
             if sentiment_volatility > 30:  # High sentiment swings
                 influence_patterns['sentiment_manipulation_detected'] = True
                 influence_patterns['recommendations'].append(
                     "Your emotional responses to content show high volatility. Algorithms may be triggering strong reactions."
                 )
 
-        # Detect topic echo chambers
-        topic_concentrations = {}
-        for point in timeline_points[-7:]:  # Last week
-            for topic, count in point.get('topic_distribution', {}).items():
-                topic_concentrations[topic] = topic_concentrations.get(
-                    topic, 0) + count
+        # Accumulate last week's topic and platform data in one pass
+        topic_concentrations = Counter()
+        platform_analysis = {}
+        # political_trend holds each day's lean, which every platform seen
+        # that day shares, so it is read instead of recomputed per platform
+        for point, political_lean in zip(timeline_points[-7:], political_trend[-7:]):
+            topic_concentrations.update(point.get('topic_distribution', {}))
+
+            for platform, count in point.get('platform_distribution', {}).items():
+                if platform not in platform_analysis:
+                    platform_analysis[platform] = {
+                        'political_shifts': [], 'content_counts': []}
 
+                platform_analysis[platform]['content_counts'].append(count)
+                if point['total_interactions'] > 0:
+                    platform_analysis[platform]['political_shifts'].append(
+                        political_lean)
+
+        # Detect topic echo chambers
         total_topic_interactions = sum(topic_concentrations.values())
         if total_topic_interactions > 0:
             for topic, count in topic_concentrations.items():
@@ -758,86 +1190,65 @@ Example: "You appear to be someone with a strong curiosity about technology and
                     })
 
         # Platform-specific bias detection
-        platform_analysis = {}
-        for point in timeline_points[-7:]:
-            for platform, count in point.get('platform_distribution', {}).items():
-                if platform not in platform_analysis:
-                    platform_analysis[platform] = {
-                        'political_shifts': [], 'content_counts': []}
-
-                platform_analysis[platform]['content_counts'].append(count)
-                # Calculate political lean for this platform on this day
-                total_day_interactions = point['total_interactions']
-                if total_day_interactions > 0:
-                    political_lean = point['political_left'] - \
-                        point['political_right']
-                    platform_analysis[platform]['political_shifts'].append(
-                        political_lean)
-
         for platform, data in platform_analysis.items():
             if len(data['political_shifts']) >= 3:
-                avg_lean = sum(data['political_shifts']) / \
-                    len(data['political_shifts'])
-                if abs(avg_lean) > 15:  # Strong political bias on this platform
+                avg_lean = self._mean(data['political_shifts'])
+                strength = abs(avg_lean)
+                if strength > 15:  # Strong political bias on this platform
+                    lean = 'left' if avg_lean > 0 else 'right'
                     influence_patterns['platform_bias_warnings'].append({
                         'platform': platform,
-                        'bias_direction': 'left-leaning' if avg_lean > 0 else 'right-leaning',
-                        'strength': abs(avg_lean),
-                        'warning': f"{platform.title()} is showing you predominantly {('left' if avg_lean > 0 else 'right')}-leaning content"
+                        'bias_direction': f"{lean}-leaning",
+                        'strength': strength,
+                        'warning': f"{platform.title()} is showing you predominantly {lean}-leaning content"
                     })
 
         return influence_patterns
 
     def analyze_topic_bias_detection(self, behavior_logs: List[BehaviorLog], days_back: int = 30) -> Dict[str, Any]:
         """Analyze what topics algorithms are pushing towards the user."""
-        from datetime import datetime, timedelta
-
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        recent_logs = [
-            log for log in behavior_logs if log.timestamp >= cutoff_date]
+        recent_logs = self._recent_logs(behavior_logs, days_back)
 
         # Analyze topic exposure patterns
         topic_exposure = {}
-        platform_topic_bias = {}
+        platform_topic_bias = defaultdict(Counter)
 
         for log in recent_logs:
             platform = self._get_platform_from_log(log)
 
             # Extract topics from this interaction
             for keyword in log.keywords:
-                for topic, topic_keywords in self.topic_keywords.items():
-                    if any(tk in keyword.lower() for tk in topic_keywords):
-                        # Overall topic exposure
-                        if topic not in topic_exposure:
-                            topic_exposure[topic] = {
-                                'total_count': 0,
-                                'platform_breakdown': {},
-                                'sentiment_breakdown': {'positive': 0, 'negative': 0, 'neutral': 0},
-                                'political_breakdown': {'left': 0, 'right': 0, 'neutral': 0}
-                            }
-
-                        topic_data = topic_exposure[topic]
-                        topic_data['total_count'] += 1
-
-                        # Platform breakdown
-                        topic_data['platform_breakdown'][platform] = topic_data['platform_breakdown'].get(
-                            platform, 0) + 1
-
-                        # Sentiment breakdown
-                        if log.sentiment:
-                            topic_data['sentiment_breakdown'][log.sentiment] += 1
-
-                        # Political breakdown
-                        if log.political_tilt:
-                            topic_data['political_breakdown'][log.political_tilt] += 1
-
-                        # Platform-specific topic bias
-                        if platform not in platform_topic_bias:
-                            platform_topic_bias[platform] = {}
-                        platform_topic_bias[platform][topic] = platform_topic_bias[platform].get(
-                            topic, 0) + 1
-
-                        break
+                # Count the keyword under its first matching topic
+                topics = self._match_topics(keyword)
+                if not topics:
+                    continue
+                topic = topics[0]
+
+                # Overall topic exposure
+                if topic not in topic_exposure:
+                    topic_exposure[topic] = {
+                        'total_count': 0,
+                        'platform_breakdown': Counter(),
+                        'sentiment_breakdown': {'positive': 0, 'negative': 0, 'neutral': 0},
+                        'political_breakdown': {'left': 0, 'right': 0, 'neutral': 0}
+                    }
+
+                topic_data = topic_exposure[topic]
+                topic_data['total_count'] += 1
+
+                # Platform breakdown
+                topic_data['platform_breakdown'][platform] += 1
+
+                # Sentiment breakdown
+                if log.sentiment:
+                    topic_data['sentiment_breakdown'][log.sentiment] += 1
+
+                # Political breakdown
+                if log.political_tilt:
+                    topic_data['political_breakdown'][log.political_tilt] += 1
+
+                # Platform-specific topic bias
+                platform_topic_bias[platform][topic] += 1
 
         # Calculate bias scores and recommendations
         total_interactions = len(recent_logs)
@@ -851,10 +1262,10 @@ Example: "You appear to be someone with a strong curiosity about technology and
             # Detect if this topic is being pushed disproportionately
             if topic_percentage > 20:  # More than 20% of all content
                 # Analyze the sentiment bias in this topic
-                sentiment_bias = self._calculate_sentiment_bias(
-                    data['sentiment_breakdown'])
-                political_bias = self._calculate_political_bias(
-                    data['political_breakdown'])
+                sentiment_bias = self._calculate_bias(
+                    data['sentiment_breakdown'], 'dominant_sentiment')
+                political_bias = self._calculate_bias(
+                    data['political_breakdown'], 'dominant_lean')
 
                 algorithmic_push_detected.append({
                     'topic': topic,
@@ -878,42 +1289,25 @@ Example: "You appear to be someone with a strong curiosity about technology and
             'analysis_period_days': days_back
         }
 
-    def _calculate_sentiment_bias(self, sentiment_breakdown: Dict[str, int]) -> Dict[str, Any]:
-        """Calculate sentiment bias in topic exposure."""
-        total = sum(sentiment_breakdown.values())
-        if total == 0:
-            return {'bias_detected': False, 'dominant_sentiment': 'neutral', 'bias_strength': 0}
-
-        sentiment_percentages = {
-            k: (v / total) * 100 for k, v in sentiment_breakdown.items()}
-        dominant_sentiment = max(
-            sentiment_percentages, key=sentiment_percentages.get)
-        bias_strength = sentiment_percentages[dominant_sentiment]
-
-        return {
-            'bias_detected': bias_strength > 60,  # More than 60% of one sentiment
-            'dominant_sentiment': dominant_sentiment,
-            'bias_strength': bias_strength,
-            'distribution': sentiment_percentages
-        }
+    def _calculate_bias(self, breakdown: Dict[str, int], dominant_key: str) -> Dict[str, Any]:
+        """Calculate sentiment or political bias in topic exposure.
 
-    def _calculate_political_bias(self, political_breakdown: Dict[str, int]) -> Dict[str, Any]:
-        """Calculate political bias in topic exposure."""
-        total = sum(political_breakdown.values())
+        dominant_key names the field reporting the winning label
+        ('dominant_sentiment' or 'dominant_lean').
+        """
+        total = sum(breakdown.values())
         if total == 0:
-            return {'bias_detected': False, 'dominant_lean': 'neutral', 'bias_strength': 0}
+            return {'bias_detected': False, dominant_key: 'neutral', 'bias_strength': 0}
 
-        political_percentages = {
-            k: (v / total) * 100 for k, v in political_breakdown.items()}
-        dominant_lean = max(political_percentages,
-                            key=political_percentages.get)
-        bias_strength = political_percentages[dominant_lean]
+        percentages = {k: (v / total) * 100 for k, v in breakdown.items()}
+        dominant = self._argmax(percentages)
+        bias_strength = percentages[dominant]
 
         return {
-            'bias_detected': bias_strength > 60,  # More than 60% of one political lean
-            'dominant_lean': dominant_lean,
+            'bias_detected': bias_strength > 60,  # More than 60% of one label
+            dominant_key: dominant,
             'bias_strength': bias_strength,
-            'distribution': political_percentages
+            'distribution': percentages
         }
 
     def _detect_coordinated_topic_pushing(self, platform_topic_bias: Dict[str, Dict[str, int]]) -> List[Dict[str, Any]]:
@@ -936,12 +1330,13 @@ Example: "You appear to be someone with a strong curiosity about technology and
 
         for topic, data in topic_platform_count.items():
             # Appears on 2+ platforms with significant volume
-            if len(data['platforms']) >= 2 and data['total_count'] >= 10:
+            n = len(data['platforms'])
+            if n >= 2 and data['total_count'] >= 10:
                 # Check if the distribution is suspiciously even across platforms
                 platform_counts = [p['count'] for p in data['platforms']]
-                avg_count = sum(platform_counts) / len(platform_counts)
+                avg_count = data['total_count'] / n
                 variance = sum(
-                    (count - avg_count) ** 2 for count in platform_counts) / len(platform_counts)
+                    (count - avg_count) ** 2 for count in platform_counts) / n
 
                 if variance < avg_count * 0.5:  # Low variance = suspiciously even distribution
                     coordinated_topics.append({
@@ -949,92 +1344,131 @@ Example: "You appear to be someone with a strong curiosity about technology and
                         'platforms': [p['platform'] for p in data['platforms']],
                         'total_exposure': data['total_count'],
                         'coordination_strength': (avg_count / variance) if variance > 0 else float('inf'),
-                        'warning': f"{topic.title()} content is being pushed consistently across {len(data['platforms'])} platforms"
+                        'warning': f"{topic.title()} content is being pushed consistently across {n} platforms"
                     })
 
         return coordinated_topics
 
     def generate_perception_analysis(self, behavior_logs: List[BehaviorLog], persona_profile: Dict[str, Any], perceiver_type: str) -> Dict[str, Any]:
         """Generate analysis of how a specific type of person would perceive the user."""
+        inputs = self._perception_inputs(behavior_logs, (perceiver_type,))
+        return self._perceive(perceiver_type, inputs, persona_profile)
+
+    def generate_perception_analyses(self, behavior_logs: List[BehaviorLog], persona_profile: Dict[str, Any],
+                                     perceiver_types: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Generate several perception analyses from one pass over the logs; all perceivers by default."""
+        perceiver_types = tuple(
+            self._perceivers if perceiver_types is None else perceiver_types)
+        inputs = self._perception_inputs(behavior_logs, perceiver_types)
+        return {perceiver_type: self._perceive(perceiver_type, inputs, persona_profile)
+                for perceiver_type in perceiver_types}
+
+    def _perceive(self, perceiver_type: str, inputs: Tuple, persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch prepared perception inputs to the matching perceiver."""
+        *columns, stats = inputs
+        # Every log has a timestamp, so an empty hour histogram means no logs;
+        # skip the scoring pipeline and report the gap directly. Perceivers
+        # can therefore rely on non-empty hour and platform counts.
+        if not stats["total_time"]:
+            return self._empty_perception(perceiver_type)
+
+        perceiver = self._perceivers.get(
+            perceiver_type, self._generate_general_perception)
+        return perceiver(*columns, persona_profile, stats)
+
+    def _empty_perception(self, perceiver_type: str) -> Dict[str, Any]:
+        """Build the perception returned when there is no behavior to analyze."""
+        return {
+            "perceiver_type": perceiver_type,
+            "overall_impression": "insufficient_data",
+            "message": "Not enough data for perception analysis. Continue using the web to build your digital profile.",
+            "recommendations": ["Use the browser extension to track more online behavior", "Engage with diverse content to build a richer profile"]
+        }
 
-        # Extract key behavioral patterns
-        all_keywords = []
-        content_samples = []
-        platform_activity = {}
-        time_patterns = {}
+    def _perception_inputs(self, behavior_logs: List[BehaviorLog], perceiver_types: Tuple[str, ...]) -> Tuple:
+        """Collect the inputs shared by the requested perceivers, with their reductions."""
 
-        for log in behavior_logs:
-            all_keywords.extend(log.keywords)
-            if log.content:
-                content_samples.append(log.content)
+        # Keywords, label counts and behavior types come from the shared
+        # aggregation pass; content and hours are read as their own columns
+        activity = self._aggregate_logs(behavior_logs)["all"]
+        content_samples = list(
+            filter(None, map(attrgetter("content"), behavior_logs)))
 
-            # Track platform usage
-            platform = self._get_platform_from_log(log)
-            platform_activity[platform] = platform_activity.get(
-                platform, 0) + 1
+        # Track platform usage, derived per behavior_type rather than per log
+        platform_activity = Counter()
+        for behavior_type, count in activity["behavior_types"].items():
+            platform_activity[self._platform_for_type(behavior_type)] += count
 
-            # Track time patterns
-            hour = log.timestamp.hour
-            time_patterns[hour] = time_patterns.get(hour, 0) + 1
+        # Track time patterns
+        time_patterns = Counter(log.timestamp.hour for log in behavior_logs)
 
         # Analyze topics and interests
-        topic_counts = self.extract_topics_from_keywords(all_keywords)
-        sentiment_dist = self.analyze_sentiment_distribution(behavior_logs)
-        political_dist = self.analyze_political_tilt_distribution(
-            behavior_logs)
-
-        # Generate perceiver-specific analysis
-        if perceiver_type == "advertiser":
-            return self._generate_advertiser_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        elif perceiver_type == "content_feeder":
-            return self._generate_content_feeder_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        elif perceiver_type == "data_broker":
-            return self._generate_data_broker_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        elif perceiver_type == "ai_system":
-            return self._generate_ai_system_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        # Keep legacy support for now
-        elif perceiver_type == "recruiter":
-            return self._generate_recruiter_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        elif perceiver_type == "romantic_partner":
-            return self._generate_romantic_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        elif perceiver_type == "colleague":
-            return self._generate_colleague_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        elif perceiver_type == "family_member":
-            return self._generate_family_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
-        else:
-            return self._generate_general_perception(
-                topic_counts, sentiment_dist, political_dist,
-                platform_activity, time_patterns, content_samples, persona_profile
-            )
+        topic_counts = self.extract_topics_from_keywords(activity["keywords"])
+        sentiment_dist = self._distribution(
+            activity["sentiment"], SENTIMENT_LABELS)
+        political_dist = self._distribution(
+            activity["political"], POLITICAL_LABELS)
+
+        stats = self._perception_stats(
+            topic_counts, sentiment_dist, platform_activity, time_patterns)
+        stats["lowered_samples"] = tuple(map(str.lower, content_samples))
+        # Only scan for the keyword sets the requested perceivers read
+        stats["keyword_hits"] = self._count_keyword_hits(
+            stats["lowered_samples"],
+            {PERCEIVER_KEYWORD_SETS[perceiver_type] for perceiver_type in perceiver_types
+             if perceiver_type in PERCEIVER_KEYWORD_SETS})
+        return (topic_counts, sentiment_dist, political_dist,
+                platform_activity, time_patterns, content_samples, stats)
+
+    def _count_keyword_hits(self, lowered_samples: Tuple[str, ...], names: Iterable[str]) -> Dict[str, int]:
+        """Count lowercased samples matching each named content keyword set."""
+        return {name: sum(map(bool, map(CONTENT_KEYWORD_PATTERNS[name].search, lowered_samples)))
+                for name in names}
+
+    def _perception_stats(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
+                          platform_activity: Dict[str, int], time_patterns: Dict[int, int]) -> Dict[str, Any]:
+        """Reduce the perceiver inputs to the totals and peaks the perceivers share."""
+        hours = [0] * 24
+        for hour, count in time_patterns.items():
+            hours[hour] = count
+        dominant_sentiment, max_sentiment, min_sentiment = self._reduce_sentiment(
+            sentiment_dist)
+
+        return {
+            "total_interactions": sum(topic_counts.values()) if topic_counts else 1,
+            "total_time": sum(hours),
+            "work_time": sum(hours[WORK_HOURS]),
+            "evening_time": sum(hours[EVENING_HOURS]),
+            "peak_hour": max(time_patterns.items(), key=itemgetter(1)) if time_patterns else (12, 0),
+            "platform_total": sum(platform_activity.values()),
+            "top_topic": max(topic_counts.items(), key=itemgetter(1)) if topic_counts else ("unknown", 0),
+            "dominant_sentiment": (dominant_sentiment, max_sentiment),
+            "max_sentiment": max_sentiment,
+            "min_sentiment": min_sentiment,
+        }
+
+    def _impression(self, perceiver_type: str, score: int) -> str:
+        """Map a perceiver's final score to its overall_impression label."""
+        cutoffs, labels = IMPRESSION_THRESHOLDS[perceiver_type]
+        return labels[bisect_right(cutoffs, score)]
+
+    def _reduce_sentiment(self, sentiment_dist: Dict[str, float]) -> Tuple[str, float, float]:
+        """Return the dominant label with the max and min shares in one pass."""
+        if not sentiment_dist:
+            return "neutral", 0, 0
+        dominant, max_share, min_share = None, None, None
+        for label, share in sentiment_dist.items():
+            if max_share is None or share > max_share:
+                dominant, max_share = label, share
+            if min_share is None or share < min_share:
+                min_share = share
+        return dominant, max_share, min_share
 
     def _generate_recruiter_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                        political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                        time_patterns: Dict[int, int], content_samples: List[str],
-                                       persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                       persona_profile: Dict[str, Any],
+                                       stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how a recruiter would perceive this person."""
 
         perception = {
@@ -1052,16 +1486,16 @@ Example: "You appear to be someone with a strong curiosity about technology and
         professional_score = 0
 
         # Analyze professional interests
-        professional_topics = ["technology", "career", "education", "finance"]
         professional_interest = sum(topic_counts.get(topic, 0)
-                                    for topic in professional_topics)
-        total_interactions = sum(topic_counts.values()) if topic_counts else 1
+                                    for topic in PROFESSIONAL_TOPICS)
+        total_interactions = stats["total_interactions"]
+        professional_ratio = professional_interest / total_interactions
 
-        if professional_interest / total_interactions > 0.6:
+        if professional_ratio > 0.6:
             perception["strengths"].append(
                 "Strong focus on professional development and industry knowledge")
             professional_score += 20
-        elif professional_interest / total_interactions > 0.3:
+        elif professional_ratio > 0.3:
             perception["strengths"].append(
                 "Good balance of professional and personal interests")
             professional_score += 10
@@ -1096,30 +1530,28 @@ Example: "You appear to be someone with a strong curiosity about technology and
             professional_score += 15
 
         # Check time patterns for work-life balance
-        work_hours = sum(time_patterns.get(hour, 0)
-                         for hour in range(9, 18))  # 9 AM to 6 PM
-        total_activity = sum(time_patterns.values()) if time_patterns else 1
+        work_hours = stats["work_time"]
+        total_activity = stats["total_time"] or 1
+        work_hours_ratio = work_hours / total_activity
 
-        if work_hours / total_activity > 0.7:
+        if work_hours_ratio > 0.7:
             perception["concerns"].append(
                 "Heavy internet usage during work hours - potential productivity concerns")
             professional_score -= 15
-        elif work_hours / total_activity < 0.3:
+        elif work_hours_ratio < 0.3:
             perception["strengths"].append("Good work-life digital boundaries")
             professional_score += 10
 
         # Look for red flags in content
-        red_flag_keywords = ["hate", "discriminat",
-                             "illegal", "fired", "lawsuit", "drunk", "party"]
-        for sample in content_samples[:10]:  # Check recent content
-            if any(flag in sample.lower() for flag in red_flag_keywords):
+        for sample in stats["lowered_samples"][:10]:  # Check recent content
+            if RECRUITER_RED_FLAGS.search(sample):
                 perception["red_flags"].append(
                     "Potentially concerning language or behavior patterns in online content")
                 professional_score -= 25
                 break
 
         # Technology engagement
-        if topic_counts.get("technology", 0) > sum(topic_counts.values()) * 0.2:
+        if topic_counts.get("technology", 0) > total_interactions * 0.2:
             perception["strengths"].append(
                 "Tech-savvy, likely adaptable to new digital tools and systems")
             professional_score += 10
@@ -1129,14 +1561,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
             0, min(100, professional_score + 50))
         perception["hire_likelihood"] = perception["professional_score"]
 
-        if perception["hire_likelihood"] >= 75:
-            perception["overall_impression"] = "very_positive"
-        elif perception["hire_likelihood"] >= 60:
-            perception["overall_impression"] = "positive"
-        elif perception["hire_likelihood"] >= 40:
-            perception["overall_impression"] = "neutral"
-        else:
-            perception["overall_impression"] = "concerning"
+        perception["overall_impression"] = self._impression(
+            "recruiter", perception["hire_likelihood"])
 
         # Generate recommendations
         if professional_score < 40:
@@ -1154,7 +1580,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "Demonstrate continuous learning through educational content engagement")
 
         perception["detailed_analysis"] = {
-            "professional_interests": f"{(professional_interest / total_interactions * 100):.1f}% of content",
+            "professional_interests": f"{(professional_ratio * 100):.1f}% of content",
             "political_engagement": political_dist,
             "sentiment_profile": sentiment_dist,
             "platform_usage": platform_activity,
@@ -1166,7 +1592,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_romantic_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                       political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                       time_patterns: Dict[int, int], content_samples: List[str],
-                                      persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                      persona_profile: Dict[str, Any],
+                                      stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how a potential romantic partner would perceive this person."""
 
         perception = {
@@ -1193,7 +1620,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
             compatibility_score -= 20
 
         # Check for balanced interests
-        total_interactions = sum(topic_counts.values()) if topic_counts else 1
+        total_interactions = stats["total_interactions"]
         entertainment_ratio = topic_counts.get(
             "entertainment", 0) / total_interactions
         lifestyle_ratio = topic_counts.get("lifestyle", 0) / total_interactions
@@ -1210,12 +1637,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
             compatibility_score += 10
 
         # Look for relationship red flags
-        red_flag_patterns = ["ex-", "dating app", "hookup",
-                             "single", "breakup", "toxic", "cheating"]
-        relationship_content_count = 0
-        for sample in content_samples[:15]:
-            if any(pattern in sample.lower() for pattern in red_flag_patterns):
-                relationship_content_count += 1
+        relationship_content_count = sum(
+            map(bool, map(ROMANTIC_RED_FLAGS.search, stats["lowered_samples"][:15])))
 
         if relationship_content_count > 3:
             perception["red_flags"].append(
@@ -1239,17 +1662,16 @@ Example: "You appear to be someone with a strong curiosity about technology and
             compatibility_score += 8
 
         # Social media usage patterns
-        social_platforms = ["twitter", "instagram"]
         social_activity = sum(platform_activity.get(platform, 0)
-                              for platform in social_platforms)
-        total_activity = sum(platform_activity.values()
-                             ) if platform_activity else 1
+                              for platform in SOCIAL_PLATFORMS)
+        total_activity = stats["platform_total"] or 1
+        social_ratio = social_activity / total_activity
 
-        if social_activity / total_activity > 0.7:
+        if social_ratio > 0.7:
             perception["potential_concerns"].append(
                 "Heavy social media usage - may prioritize online validation over real connections")
             compatibility_score -= 15
-        elif social_activity / total_activity < 0.2:
+        elif social_ratio < 0.2:
             perception["attractive_qualities"].append(
                 "Not overly focused on social media - likely present in real-life interactions")
             compatibility_score += 10
@@ -1261,18 +1683,14 @@ Example: "You appear to be someone with a strong curiosity about technology and
             compatibility_score += 12
 
         # Time availability patterns
-        evening_activity = sum(time_patterns.get(hour, 0)
-                               for hour in range(18, 23))  # 6 PM to 11 PM
-        if evening_activity / sum(time_patterns.values()) > 0.4 if time_patterns else False:
+        evening_activity = stats["evening_time"]
+        if evening_activity / stats["total_time"] > 0.4:
             perception["potential_concerns"].append(
                 "Heavy internet usage during evening hours - may limit quality time together")
             compatibility_score -= 10
 
         # Look for creative/artistic interests
-        creative_keywords = ["art", "music", "creative",
-                             "design", "photography", "writing"]
-        creative_content = sum(1 for sample in content_samples if any(
-            word in sample.lower() for word in creative_keywords))
+        creative_content = stats["keyword_hits"]["creative"]
         if creative_content > 2:
             perception["attractive_qualities"].append(
                 "Creative interests and artistic appreciation")
@@ -1282,14 +1700,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
         perception["compatibility_score"] = max(
             0, min(100, compatibility_score + 50))
 
-        if perception["compatibility_score"] >= 75:
-            perception["overall_impression"] = "very_attractive"
-        elif perception["compatibility_score"] >= 60:
-            perception["overall_impression"] = "attractive"
-        elif perception["compatibility_score"] >= 40:
-            perception["overall_impression"] = "neutral"
-        else:
-            perception["overall_impression"] = "concerning"
+        perception["overall_impression"] = self._impression(
+            "romantic_partner", perception["compatibility_score"])
 
         # Generate relationship insights
         if sentiment_dist.get("positive", 0) > 0.6:
@@ -1307,7 +1719,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
         perception["detailed_analysis"] = {
             "emotional_tone": sentiment_dist,
             "political_alignment": political_dist,
-            "social_media_engagement": f"{(social_activity / total_activity * 100):.1f}% of activity",
+            "social_media_engagement": f"{(social_ratio * 100):.1f}% of activity",
             "interests_diversity": len(topic_counts),
             "relationship_discretion": "High" if relationship_content_count == 0 else "Low"
         }
@@ -1317,7 +1729,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_colleague_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                        political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                        time_patterns: Dict[int, int], content_samples: List[str],
-                                       persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                       persona_profile: Dict[str, Any],
+                                       stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how a colleague would perceive this person."""
 
         perception = {
@@ -1348,9 +1761,9 @@ Example: "You appear to be someone with a strong curiosity about technology and
             collaboration_score += 5
 
         # Professional interests alignment
-        work_related = topic_counts.get(
-            "technology", 0) + topic_counts.get("career", 0) + topic_counts.get("education", 0)
-        total_interests = sum(topic_counts.values()) if topic_counts else 1
+        work_related = sum(topic_counts.get(topic, 0)
+                           for topic in COLLEAGUE_WORK_TOPICS)
+        total_interests = stats["total_interactions"]
 
         if work_related / total_interests > 0.4:
             perception["team_fit_qualities"].append(
@@ -1366,21 +1779,16 @@ Example: "You appear to be someone with a strong curiosity about technology and
         perception["collaboration_score"] = max(
             0, min(100, collaboration_score + 50))
 
-        if perception["collaboration_score"] >= 70:
-            perception["overall_impression"] = "excellent_colleague"
-        elif perception["collaboration_score"] >= 55:
-            perception["overall_impression"] = "good_colleague"
-        elif perception["collaboration_score"] >= 40:
-            perception["overall_impression"] = "neutral"
-        else:
-            perception["overall_impression"] = "challenging_colleague"
+        perception["overall_impression"] = self._impression(
+            "colleague", perception["collaboration_score"])
 
         return perception
 
     def _generate_family_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                     political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                     time_patterns: Dict[int, int], content_samples: List[str],
-                                    persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                    persona_profile: Dict[str, Any],
+                                    stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how a family member would perceive this person."""
 
         perception = {
@@ -1402,9 +1810,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
             harmony_score += 15
 
         # Check for concerning content
-        concerning_keywords = ["party", "drunk", "wild", "inappropriate"]
-        concerning_content = sum(1 for sample in content_samples if any(
-            word in sample.lower() for word in concerning_keywords))
+        concerning_content = stats["keyword_hits"]["concerning"]
 
         if concerning_content > 2:
             perception["family_concerns"].append(
@@ -1425,7 +1831,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_general_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                      political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                      time_patterns: Dict[int, int], content_samples: List[str],
-                                     persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                     persona_profile: Dict[str, Any],
+                                     stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a general perception analysis."""
 
         return {
@@ -1444,7 +1851,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_advertiser_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                         political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                         time_patterns: Dict[int, int], content_samples: List[str],
-                                        persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                        persona_profile: Dict[str, Any],
+                                        stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how an advertiser would perceive this person for targeting."""
 
         perception = {
@@ -1459,12 +1867,11 @@ Example: "You appear to be someone with a strong curiosity about technology and
         }
 
         targeting_score = 0
-        total_interactions = sum(topic_counts.values()) if topic_counts else 1
+        total_interactions = stats["total_interactions"]
 
         # Analyze purchase intent signals
-        purchase_topics = ["technology", "health", "finance", "lifestyle"]
         purchase_signals = sum(topic_counts.get(topic, 0)
-                               for topic in purchase_topics)
+                               for topic in PURCHASE_TOPICS)
 
         if purchase_signals / total_interactions > 0.5:
             perception["valuable_signals"].append(
@@ -1472,8 +1879,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
             targeting_score += 20
 
         # Analyze engagement patterns for ad timing
-        peak_hours = max(time_patterns.items(),
-                         key=lambda x: x[1]) if time_patterns else (12, 0)
+        peak_hours = stats["peak_hour"]
         if peak_hours[1] > 0:
             perception["valuable_signals"].append(
                 f"Predictable online activity pattern - most active around {peak_hours[0]:02d}:00")
@@ -1524,14 +1930,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
         # Calculate final score
         perception["targeting_value"] = max(0, min(100, targeting_score + 50))
 
-        if perception["targeting_value"] >= 75:
-            perception["overall_impression"] = "high_value"
-        elif perception["targeting_value"] >= 60:
-            perception["overall_impression"] = "valuable"
-        elif perception["targeting_value"] >= 40:
-            perception["overall_impression"] = "neutral"
-        else:
-            perception["overall_impression"] = "low_value"
+        perception["overall_impression"] = self._impression(
+            "advertiser", perception["targeting_value"])
 
         # Generate recommendations
         if targeting_score < 40:
@@ -1552,7 +1952,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_content_feeder_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                             political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                             time_patterns: Dict[int, int], content_samples: List[str],
-                                            persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                            persona_profile: Dict[str, Any],
+                                            stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how a content recommendation algorithm would perceive this user."""
 
         perception = {
@@ -1567,31 +1968,28 @@ Example: "You appear to be someone with a strong curiosity about technology and
         }
 
         engagement_score = 0
-        total_interactions = sum(topic_counts.values()) if topic_counts else 1
+        total_interactions = stats["total_interactions"]
 
         # Analyze content consumption patterns
-        top_topic = max(topic_counts.items(),
-                        key=lambda x: x[1]) if topic_counts else ("unknown", 0)
+        top_topic = stats["top_topic"]
         if top_topic[1] / total_interactions > 0.4:
             perception["engagement_drivers"].append(
                 f"Strong preference for {top_topic[0]} content - high engagement probability")
             engagement_score += 20
 
         # Check for binge-watching/reading patterns
-        session_patterns = list(time_patterns.values())
-        if session_patterns and max(session_patterns) > sum(session_patterns) * 0.3:
+        if stats["peak_hour"][1] > stats["total_time"] * 0.3:
             perception["engagement_drivers"].append(
                 "Concentrated usage patterns - good for session-based recommendations")
             engagement_score += 15
 
         # Sentiment consistency for content matching
-        dominant_sentiment = max(sentiment_dist.items(
-        ), key=lambda x: x[1]) if sentiment_dist else ("neutral", 0)
+        dominant_sentiment = stats["dominant_sentiment"]
         if dominant_sentiment[1] > 0.6:
             perception["engagement_drivers"].append(
                 f"Consistent {dominant_sentiment[0]} content preference")
             engagement_score += 10
-        elif max(sentiment_dist.values()) < 0.4:
+        elif stats["max_sentiment"] < 0.4:
             perception["algorithm_challenges"].append(
                 "Inconsistent sentiment preferences make content matching difficult")
             engagement_score -= 15
@@ -1607,7 +2005,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
             engagement_score -= 10
 
         # Interest diversity vs depth
-        interest_depth = max(topic_counts.values()) / \
+        interest_depth = top_topic[1] / \
             total_interactions if total_interactions > 0 else 0
         interest_breadth = len(topic_counts)
 
@@ -1630,14 +2028,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
         perception["engagement_score"] = max(
             0, min(100, engagement_score + 50))
 
-        if perception["engagement_score"] >= 75:
-            perception["overall_impression"] = "highly_predictable"
-        elif perception["engagement_score"] >= 60:
-            perception["overall_impression"] = "targetable"
-        elif perception["engagement_score"] >= 40:
-            perception["overall_impression"] = "neutral"
-        else:
-            perception["overall_impression"] = "unpredictable"
+        perception["overall_impression"] = self._impression(
+            "content_feeder", perception["engagement_score"])
 
         perception["detailed_analysis"] = {
             "primary_interest": top_topic[0],
@@ -1651,7 +2043,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_data_broker_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                          political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                          time_patterns: Dict[int, int], content_samples: List[str],
-                                         persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                         persona_profile: Dict[str, Any],
+                                         stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how a data broker would value this user's information."""
 
         perception = {
@@ -1666,12 +2059,11 @@ Example: "You appear to be someone with a strong curiosity about technology and
         }
 
         data_score = 0
-        total_interactions = sum(topic_counts.values()) if topic_counts else 1
+        total_interactions = stats["total_interactions"]
 
         # High-value demographic indicators
-        valuable_topics = ["finance", "health", "technology", "career"]
         valuable_signals = sum(topic_counts.get(topic, 0)
-                               for topic in valuable_topics)
+                               for topic in VALUABLE_TOPICS)
 
         if valuable_signals / total_interactions > 0.4:
             perception["profitable_traits"].append(
@@ -1679,17 +2071,14 @@ Example: "You appear to be someone with a strong curiosity about technology and
             data_score += 25
 
         # Behavioral predictability (valuable for modeling)
-        time_consistency = max(time_patterns.values()) / \
-            sum(time_patterns.values()) if time_patterns else 0
+        time_consistency = stats["peak_hour"][1] / stats["total_time"]
         if time_consistency > 0.3:
             perception["profitable_traits"].append(
                 "Predictable behavior patterns valuable for modeling")
             data_score += 15
 
         # Purchase intent signals
-        shopping_keywords = ["buy", "purchase", "review", "price", "deal"]
-        purchase_signals = sum(1 for sample in content_samples if any(
-            keyword in sample.lower() for keyword in shopping_keywords))
+        purchase_signals = stats["keyword_hits"]["shopping"]
 
         if purchase_signals > len(content_samples) * 0.2:
             perception["profitable_traits"].append(
@@ -1698,15 +2087,14 @@ Example: "You appear to be someone with a strong curiosity about technology and
 
         # Location/mobility data (implied from platform usage)
         mobile_indicators = platform_activity.get(
-            "mobile", 0) / sum(platform_activity.values()) if platform_activity else 0
+            "mobile", 0) / stats["platform_total"]
         if mobile_indicators > 0.5:
             perception["profitable_traits"].append(
                 "High mobile usage suggests location data availability")
             data_score += 12
 
-        # Data completeness assessment
-        data_richness = len(topic_counts) + \
-            len(platform_activity) + (1 if time_patterns else 0)
+        # Data completeness assessment; time patterns always count as one
+        data_richness = len(topic_counts) + len(platform_activity) + 1
         if data_richness < 5:
             perception["data_gaps"].append(
                 "Limited data points reduce profile completeness")
@@ -1721,8 +2109,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
             data_score -= 20
 
         # Sentiment stability (affects data reliability)
-        sentiment_volatility = max(sentiment_dist.values(
-        )) - min(sentiment_dist.values()) if sentiment_dist else 0
+        sentiment_volatility = stats["max_sentiment"] - \
+            stats["min_sentiment"] if sentiment_dist else 0
         if sentiment_volatility > 0.4:
             perception["data_gaps"].append(
                 "High sentiment volatility reduces data reliability")
@@ -1737,14 +2125,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
         # Calculate final score
         perception["data_value"] = max(0, min(100, data_score + 50))
 
-        if perception["data_value"] >= 75:
-            perception["overall_impression"] = "premium_profile"
-        elif perception["data_value"] >= 60:
-            perception["overall_impression"] = "valuable_data"
-        elif perception["data_value"] >= 40:
-            perception["overall_impression"] = "standard_profile"
-        else:
-            perception["overall_impression"] = "limited_value"
+        perception["overall_impression"] = self._impression(
+            "data_broker", perception["data_value"])
 
         perception["detailed_analysis"] = {
             "demographic_value": f"{(valuable_signals / total_interactions * 100):.1f}% high-value signals",
@@ -1758,7 +2140,8 @@ Example: "You appear to be someone with a strong curiosity about technology and
     def _generate_ai_system_perception(self, topic_counts: Dict[str, int], sentiment_dist: Dict[str, float],
                                        political_dist: Dict[str, float], platform_activity: Dict[str, int],
                                        time_patterns: Dict[int, int], content_samples: List[str],
-                                       persona_profile: Dict[str, Any]) -> Dict[str, Any]:
+                                       persona_profile: Dict[str, Any],
+                                       stats: Dict[str, Any]) -> Dict[str, Any]:
         """Generate how an AI system would classify and understand this user."""
 
         perception = {
@@ -1773,7 +2156,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
         }
 
         confidence_score = 0
-        total_interactions = sum(topic_counts.values()) if topic_counts else 1
+        total_interactions = stats["total_interactions"]
 
         # Data volume affects AI confidence
         if total_interactions > 100:
@@ -1785,11 +2168,11 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 "Limited data volume reduces AI prediction accuracy")
             confidence_score -= 25
 
-        # Pattern consistency
+        # Pattern consistency, as the Shannon entropy (bits) of topic shares
         if topic_counts:
-            topic_distribution_entropy = -sum((count/total_interactions) *
-                                              (count/total_interactions).bit_length()
-                                              for count in topic_counts.values() if count > 0)
+            topic_distribution_entropy = -sum(
+                share * math.log2(share)
+                for share in (count / total_interactions for count in topic_counts.values() if count > 0))
 
             if topic_distribution_entropy < 2:  # Low entropy = consistent patterns
                 perception["ai_advantages"].append(
@@ -1801,8 +2184,7 @@ Example: "You appear to be someone with a strong curiosity about technology and
                 confidence_score -= 15
 
         # Sentiment consistency for emotional AI
-        sentiment_consistency = max(
-            sentiment_dist.values()) if sentiment_dist else 0
+        sentiment_consistency = stats["max_sentiment"]
         if sentiment_consistency > 0.7:
             perception["ai_advantages"].append(
                 "Consistent emotional patterns improve sentiment analysis accuracy")
@@ -1813,17 +2195,15 @@ Example: "You appear to be someone with a strong curiosity about technology and
             confidence_score -= 10
 
         # Temporal pattern recognition
-        if time_patterns:
-            time_variance = max(time_patterns.values()) / \
-                sum(time_patterns.values())
-            if time_variance > 0.4:
-                perception["ai_advantages"].append(
-                    "Strong temporal patterns enable time-based predictions")
-                confidence_score += 10
+        time_variance = stats["peak_hour"][1] / stats["total_time"]
+        if time_variance > 0.4:
+            perception["ai_advantages"].append(
+                "Strong temporal patterns enable time-based predictions")
+            confidence_score += 10
 
         # Multi-modal data availability
-        data_dimensions = len([d for d in [topic_counts, sentiment_dist,
-                              political_dist, platform_activity, time_patterns] if d])
+        data_dimensions = sum(1 for d in (topic_counts, sentiment_dist,
+                                          political_dist, platform_activity, time_patterns) if d)
         if data_dimensions >= 4:
             perception["ai_advantages"].append(
                 "Multi-dimensional data enables sophisticated AI modeling")
@@ -1850,138 +2230,51 @@ Example: "You appear to be someone with a strong curiosity about technology and
         # Calculate final score
         perception["ai_confidence"] = max(0, min(100, confidence_score + 50))
 
-        if perception["ai_confidence"] >= 80:
-            perception["overall_impression"] = "high_confidence"
-        elif perception["ai_confidence"] >= 65:
-            perception["overall_impression"] = "reliable_predictions"
-        elif perception["ai_confidence"] >= 40:
-            perception["overall_impression"] = "moderate_accuracy"
-        else:
-            perception["overall_impression"] = "low_confidence"
+        perception["overall_impression"] = self._impression(
+            "ai_system", perception["ai_confidence"])
 
         perception["detailed_analysis"] = {
             "data_volume": total_interactions,
             "pattern_consistency": f"{(sentiment_consistency * 100):.1f}%",
             "data_dimensions": data_dimensions,
-            "temporal_predictability": f"{(time_variance * 100):.1f}%" if time_patterns else "Unknown"
+            "temporal_predictability": f"{(time_variance * 100):.1f}%"
         }
 
         return perception
 
+    async def generate_ai_perception_feedbacks(self, perceptions: Dict[str, Dict[str, Any]],
+                                               behavior_logs: List[BehaviorLog]) -> Dict[str, str]:
+        """Generate AI feedback for several perceptions concurrently, keyed by perceiver type."""
+        # Provider calls are independent network round-trips; the provider
+        # manager bounds how many run at once. Each call already falls back
+        # on its own errors, so only cancellation propagates from here.
+        results = await asyncio.gather(*(
+            self.generate_ai_perception_feedback(perception_data, behavior_logs)
+            for perception_data in perceptions.values()
+        ))
+        return dict(zip(perceptions, results))
+
     async def generate_ai_perception_feedback(self, perception_data: Dict[str, Any], behavior_logs: List[BehaviorLog]) -> str:
         """Generate AI-powered feedback on how others perceive the user."""
 
         perceiver_type = perception_data.get("perceiver_type", "unknown")
-        score_key = {
-            "advertiser": "targeting_value",
-            "content_feeder": "engagement_score",
-            "data_broker": "data_value",
-            "ai_system": "ai_confidence",
-            "recruiter": "hire_likelihood",
-            "romantic_partner": "compatibility_score",
-            "colleague": "collaboration_score",
-            "family_member": "family_harmony_score"
-        }.get(perceiver_type, "public_perception_score")
+        score_key = SCORE_KEYS.get(perceiver_type, "public_perception_score")
 
         score = perception_data.get(score_key, 50)
 
-        # Create AI prompt based on perception data
-        if perceiver_type == "advertiser":
-            prompt = f"""Based on this person's digital behavior analysis, provide feedback on their advertising profile:
-
-Score: {score}/100
-Valuable Signals: {', '.join(perception_data.get('valuable_signals', []))}
-Ad Resistance: {', '.join(perception_data.get('ad_resistance', []))}
-
-Write a 2-3 sentence assessment focusing on:
-1. How valuable this person is for targeted advertising
-2. What types of ads would be most effective
-3. Any challenges in reaching this audience
-
-Be analytical and marketing-focused."""
-
-        elif perceiver_type == "content_feeder":
-            prompt = f"""Based on this person's digital behavior analysis, provide feedback on their content algorithm profile:
-
-Score: {score}/100  
-Engagement Drivers: {', '.join(perception_data.get('engagement_drivers', []))}
-Algorithm Challenges: {', '.join(perception_data.get('algorithm_challenges', []))}
-
-Write a 2-3 sentence assessment focusing on:
-1. How predictable their content preferences are
-2. What content recommendation strategies would work best
-3. Any algorithmic challenges in serving relevant content
-
-Be technical and algorithm-focused."""
-
-        elif perceiver_type == "data_broker":
-            prompt = f"""Based on this person's digital behavior analysis, provide feedback on their data broker profile:
-
-Score: {score}/100  
-Profitable Traits: {', '.join(perception_data.get('profitable_traits', []))}
-Data Gaps: {', '.join(perception_data.get('data_gaps', []))}
-
-Write a 2-3 sentence assessment focusing on:
-1. How valuable their data profile is for resale
-2. What data points make them attractive to buyers
-3. Any limitations in data collection or reliability
-
-Be business and data-focused."""
-
-        elif perceiver_type == "ai_system":
-            prompt = f"""Based on this person's digital behavior analysis, provide feedback on their AI system profile:
-
-Score: {score}/100  
-AI Advantages: {', '.join(perception_data.get('ai_advantages', []))}
-AI Limitations: {', '.join(perception_data.get('ai_limitations', []))}
-
-Write a 2-3 sentence assessment focusing on:
-1. How well AI systems can model and predict their behavior
-2. What makes them easy or difficult for AI to understand
-3. Any data quality or pattern recognition challenges
-
-Be technical and AI-focused."""
-
-        elif perceiver_type == "recruiter":
-            prompt = f"""Based on this person's digital behavior analysis, provide specific feedback on how they appear to potential employers:
-
-Score: {score}/100
-Strengths: {', '.join(perception_data.get('strengths', []))}
-Concerns: {', '.join(perception_data.get('concerns', []))}
-Red Flags: {', '.join(perception_data.get('red_flags', []))}
-
-Write a 2-3 sentence professional assessment focusing on:
-1. What impression this person gives to recruiters
-2. Specific suggestions for improving their professional online presence
-3. Key strengths they should highlight more
-
-Be constructive and actionable."""
-
-        elif perceiver_type == "romantic_partner":
-            prompt = f"""Based on this person's digital behavior analysis, provide feedback on how they appear to potential romantic partners:
-
-Score: {score}/100  
-Attractive Qualities: {', '.join(perception_data.get('attractive_qualities', []))}
-Concerns: {', '.join(perception_data.get('potential_concerns', []))}
-Red Flags: {', '.join(perception_data.get('red_flags', []))}
-
-Write a 2-3 sentence assessment focusing on:
-1. What dating impression this person creates online
-2. How to present themselves more attractively while staying authentic
-3. Any behaviors that might be deterring potential partners
-
-Be respectful and helpful."""
-
+        prompt_template = self._perception_prompts.get(perceiver_type)
+        if prompt_template:
+            context = {field: ", ".join(perception_data.get(field, ()))
+                       for _, field in PERCEPTION_PROMPT_PARTS[perceiver_type][1]}
+            context["score"] = score
+            prompt = prompt_template.format_map(context)
         else:
-            prompt = f"""Based on this person's digital behavior, provide general feedback on their online presence:
-
-Score: {score}/100
-Overall impression: {perception_data.get('overall_impression', 'neutral')}
-
-Write 2-3 sentences about how they come across online and suggestions for improvement."""
+            prompt = self._GENERAL_PERCEPTION_PROMPT.format(
+                score=score,
+                impression=perception_data.get('overall_impression', 'neutral'))
 
         messages = [
-            {"role": "system", "content": "You are a thoughtful digital behavior analyst who provides constructive, actionable feedback on online presence."},
+            self._FEEDBACK_SYSTEM_MESSAGE,
             {"role": "user", "content": prompt}
         ]
 
@@ -1989,68 +2282,18 @@ Write 2-3 sentences about how they come across online and suggestions for improv
             result, provider_used = await ai_manager.generate_text(messages, max_tokens=200)
             return result
         except Exception as e:
-            print(f"AI feedback generation failed: {e}")
+            logger.warning("AI feedback generation failed: %s", e)
             return self._generate_fallback_feedback(perception_data, perceiver_type)
 
     def _generate_fallback_feedback(self, perception_data: Dict[str, Any], perceiver_type: str) -> str:
         """Generate fallback feedback when AI is unavailable."""
+        feedback = FALLBACK_FEEDBACK.get(perceiver_type)
+        if feedback is None:
+            return DEFAULT_FALLBACK_FEEDBACK
 
-        if perceiver_type == "advertiser":
-            score = perception_data.get("targeting_value", 50)
-            if score >= 70:
-                return "Your digital behavior shows strong consumer signals that are highly valuable for targeted advertising. Your diverse interests and predictable patterns make you an attractive target for marketers."
-            elif score >= 50:
-                return "Your online presence provides moderate value for advertisers. Consider diversifying your digital engagement to increase or decrease your advertising profile visibility."
-            else:
-                return "Your digital behavior patterns show strong resistance to advertising targeting. Your privacy-conscious behavior and unpredictable patterns make you a challenging audience to reach."
-
-        elif perceiver_type == "content_feeder":
-            score = perception_data.get("engagement_score", 50)
-            if score >= 70:
-                return "Your content consumption patterns are highly predictable, making you an ideal user for content recommendation algorithms. Your consistent preferences enable accurate content targeting."
-            elif score >= 50:
-                return "Your content behavior is moderately predictable for recommendation algorithms. Some patterns are clear while others present targeting challenges for content systems."
-            else:
-                return "Your content consumption patterns are unpredictable and challenging for recommendation algorithms. Your diverse and inconsistent preferences make content targeting difficult."
-
-        elif perceiver_type == "data_broker":
-            score = perception_data.get("data_value", 50)
-            if score >= 70:
-                return "Your digital profile is highly valuable to data brokers due to rich behavioral patterns and valuable demographic signals. Your data would command premium prices in data markets."
-            elif score >= 50:
-                return "Your digital profile has moderate value for data brokers. Some valuable signals are present but gaps limit the overall market value of your information."
-            else:
-                return "Your digital profile has limited value for data brokers due to privacy-conscious behavior and fragmented data patterns. Your information would be difficult to monetize."
-
-        elif perceiver_type == "ai_system":
-            score = perception_data.get("ai_confidence", 50)
-            if score >= 70:
-                return "AI systems can model your behavior with high confidence due to consistent patterns and rich data. Your digital footprint enables accurate predictions and classifications."
-            elif score >= 50:
-                return "AI systems have moderate confidence in modeling your behavior. Some patterns are clear while others present challenges for machine learning algorithms."
-            else:
-                return "AI systems struggle to model your behavior due to inconsistent patterns or limited data. Your digital footprint presents significant challenges for algorithmic analysis."
-
-        elif perceiver_type == "recruiter":
-            score = perception_data.get("hire_likelihood", 50)
-            if score >= 70:
-                return "Your professional online presence shows strong industry engagement and positive communication. Continue sharing expertise and professional insights to maintain this excellent impression."
-            elif score >= 50:
-                return "Your online presence is professionally acceptable but could be enhanced. Consider sharing more industry insights and reducing personal content during work hours."
-            else:
-                return "Your online presence may raise concerns for recruiters. Focus on professional content, avoid controversial topics, and showcase your expertise more prominently."
-
-        elif perceiver_type == "romantic_partner":
-            score = perception_data.get("compatibility_score", 50)
-            if score >= 70:
-                return "Your online presence suggests you're a positive, interesting person who would be an engaging partner. Your balanced interests and discrete approach to personal matters are attractive qualities."
-            elif score >= 50:
-                return "Your online presence is generally appealing but could be more attractive to potential partners. Consider sharing more positive content and diverse interests while maintaining authenticity."
-            else:
-                return "Your online behavior may not be creating the best impression for potential romantic partners. Focus on positive content, reduce controversial posts, and show your fun, creative side more."
-
-        else:
-            return "Your online presence shows authentic engagement with diverse topics. Consider your audience when posting and maintain a balance between personal expression and public perception."
+        high, moderate, low = feedback
+        score = perception_data.get(SCORE_KEYS[perceiver_type], 50)
+        return high if score >= 70 else moderate if score >= 50 else low
 
     async def generate_persona_profile(self, behavior_logs: List[BehaviorLog]) -> Dict[str, Any]:
         """Generate a persona profile from behavior logs for testing purposes."""
@@ -2066,16 +2309,16 @@ Write 2-3 sentences about how they come across online and suggestions for improv
                 'data_points_count': 0
             }
 
-        # Extract keywords and analyze topics
-        all_keywords = []
-        for log in behavior_logs:
-            all_keywords.extend(log.keywords)
+        # Aggregate logs once and analyze topics
+        aggregate = self._aggregate_logs(behavior_logs)
+        activity = aggregate["all"]
 
-        topic_counts = self.extract_topics_from_keywords(all_keywords)
-        sentiment_dist = self.analyze_sentiment_distribution(behavior_logs)
-        political_dist = self.analyze_political_tilt_distribution(
-            behavior_logs)
-        platform_behavior = self.analyze_platform_behavior(behavior_logs)
+        topic_counts = self.extract_topics_from_keywords(activity["keywords"])
+        sentiment_dist = self._distribution(
+            activity["sentiment"], SENTIMENT_LABELS)
+        political_dist = self._distribution(
+            activity["political"], POLITICAL_LABELS)
+        platform_behavior = self._summarize_platforms(aggregate)
 
         # Generate persona summary
         persona_summary = await self.generate_persona_summary(
@@ -2083,8 +2326,8 @@ Write 2-3 sentences about how they come across online and suggestions for improv
         )
 
         # Extract personality traits
-        personality_traits = self.extract_personality_traits(
-            topic_counts, sentiment_dist, political_dist, behavior_logs
+        personality_traits = self._personality_traits(
+            topic_counts, sentiment_dist, political_dist, activity
         )
 
         # Build interest network
@@ -2103,3 +2346,70 @@ Write 2-3 sentences about how they come across online and suggestions for improv
 
 # Global analyzer instance
 persona_analyzer = PersonaAnalyzer()
+
+# Worker processes for the pure-CPU timeline analyses so concurrent requests
+# don't serialize on the GIL. Started and stopped by the app (main.py); other
+# importers (scripts, migrations, the workers themselves) never create one.
+analyzer_pool: Optional[ProcessPoolExecutor] = None
+analyzer_pool_lock = threading.Lock()
+
+
+def _new_analyzer_pool() -> ProcessPoolExecutor:
+    """Create the worker pool for the platform's safest start method.
+
+    forkserver workers preload this module instead of inheriting the
+    server's threads and sockets; Windows only has spawn. Under both, each
+    worker re-imports the parent's main module as __mp_main__, so a script
+    that starts this pool must keep its work behind
+    if __name__ == "__main__".
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["ai_engine"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=context)
+
+
+def start_analyzer_pool():
+    """Create the analyzer pool if it isn't running."""
+    global analyzer_pool
+    with analyzer_pool_lock:
+        if analyzer_pool is None:
+            analyzer_pool = _new_analyzer_pool()
+
+
+def stop_analyzer_pool():
+    """Shut down the analyzer pool."""
+    global analyzer_pool
+    with analyzer_pool_lock:
+        pool, analyzer_pool = analyzer_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def run_analysis(method: str, *args):
+    """Run a PersonaAnalyzer method on this process's analyzer."""
+    return getattr(persona_analyzer, method)(*args)
+
+
+def run_pooled_analysis(method: str, *args):
+    """Run a PersonaAnalyzer method in the analyzer pool.
+
+    Without a started pool the method runs in-process. If a worker died and
+    broke the pool, the pool is replaced and this call runs in-process.
+    """
+    global analyzer_pool
+    pool = analyzer_pool
+    if pool is None:
+        return run_analysis(method, *args)
+
+    try:
+        return pool.submit(run_analysis, method, *args).result()
+    except BrokenProcessPool:
+        logger.warning("Analyzer worker died; restarting the analyzer pool")
+        with analyzer_pool_lock:
+            if analyzer_pool is pool:
+                analyzer_pool = _new_analyzer_pool()
+        pool.shutdown(wait=False)
+        return run_analysis(method, *args)
@@ -4,11 +4,31 @@ Supports multiple AI services including free alternatives to OpenAI
 """
 
 import httpx
+import hashlib
 import json
-from typing import Dict, Any, Optional
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from config import settings
 import asyncio
 
+logger = logging.getLogger("mirrorme.ai")
+
+# Shared client so provider calls reuse pooled keep-alive connections
+# instead of a fresh TCP+TLS handshake per request; closed on app shutdown
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50))
+
+# Completions are reused for identical requests within this window; polling
+# clients re-analyze unchanged data and would otherwise repeat the round-trip
+RESPONSE_CACHE_TTL = 900
+RESPONSE_CACHE_SIZE = 2048
+
+# Upper bound on provider requests in flight, to stay under per-minute quotas
+# when feedback for several perceivers is requested together
+MAX_CONCURRENT_REQUESTS = 4
+
 
 class AIProvider:
     """Base class for AI providers."""
@@ -38,11 +58,10 @@ class DeepSeekProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.base_url, headers=headers, json=data)
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
+            response = await http_client.post(self.base_url, headers=headers, json=data)
+            response.raise_for_status()
+            result = response.json()
+            return result["choices"][0]["message"]["content"].strip()
         except Exception as e:
             raise Exception(f"DeepSeek API error: {str(e)}")
 
@@ -68,11 +87,10 @@ class GroqProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.base_url, headers=headers, json=data)
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
+            response = await http_client.post(self.base_url, headers=headers, json=data)
+            response.raise_for_status()
+            result = response.json()
+            return result["choices"][0]["message"]["content"].strip()
         except Exception as e:
             raise Exception(f"Groq API error: {str(e)}")
 
@@ -99,16 +117,18 @@ class OllamaProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(f"{self.base_url}/api/generate", json=data)
-                response.raise_for_status()
-                result = response.json()
-                return result["response"].strip()
+            response = await http_client.post(f"{self.base_url}/api/generate", json=data, timeout=30.0)
+            response.raise_for_status()
+            result = response.json()
+            return result["response"].strip()
         except Exception as e:
             raise Exception(f"Ollama error: {str(e)}")
 
     def _convert_messages_to_prompt(self, messages: list) -> str:
         """Convert OpenAI-style messages to a single prompt."""
+        # PersonaAnalyzer always sends [system, user]
+        if len(messages) == 2 and messages[0]["role"] == "system" and messages[1]["role"] == "user":
+            return f"System: {messages[0]['content']}\nUser: {messages[1]['content']}\nAssistant:"
         prompt_parts = []
         for msg in messages:
             role = msg["role"]
@@ -141,11 +161,10 @@ class TogetherAIProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.base_url, headers=headers, json=data)
-                response.raise_for_status()
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
+            response = await http_client.post(self.base_url, headers=headers, json=data)
+            response.raise_for_status()
+            result = response.json()
+            return result["choices"][0]["message"]["content"].strip()
         except Exception as e:
             raise Exception(f"Together AI error: {str(e)}")
 
@@ -180,27 +199,29 @@ class GeminiProvider(AIProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}?key={self.api_key}",
-                    headers=headers,
-                    json=data
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                # Extract text from Gemini response
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    content = result["candidates"][0]["content"]["parts"][0]["text"]
-                    return content.strip()
-                else:
-                    raise Exception("No valid response from Gemini")
+            response = await http_client.post(
+                f"{self.base_url}?key={self.api_key}",
+                headers=headers,
+                json=data
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            # Extract text from Gemini response
+            if "candidates" in result and len(result["candidates"]) > 0:
+                content = result["candidates"][0]["content"]["parts"][0]["text"]
+                return content.strip()
+            else:
+                raise Exception("No valid response from Gemini")
 
         except Exception as e:
             raise Exception(f"Gemini API error: {str(e)}")
 
     def _convert_messages_to_prompt(self, messages: list) -> str:
         """Convert OpenAI-style messages to a single prompt for Gemini."""
+        # PersonaAnalyzer always sends [system, user]
+        if len(messages) == 2 and messages[0]["role"] == "system" and messages[1]["role"] == "user":
+            return f"Instructions: {messages[0]['content']}\nUser: {messages[1]['content']}"
         prompt_parts = []
         for msg in messages:
             role = msg["role"]
@@ -240,6 +261,9 @@ class AIProviderManager:
 
     def __init__(self):
         self.providers = []
+        # LRU of request digest -> (generated at, text, provider name)
+        self._response_cache: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         self._initialize_providers()
 
     def _initialize_providers(self):
@@ -250,24 +274,39 @@ class AIProviderManager:
             self.providers.append(
                 ("Gemini", GeminiProvider(settings.gemini_api_key)))
         else:
-            print(
-                "⚠️ Warning: No Gemini API key found. Please set GEMINI_API_KEY in .env file.")
+            logger.warning(
+                "No Gemini API key found. Please set GEMINI_API_KEY in .env file.")
 
-    async def generate_text(self, messages: list, max_tokens: int = 150) -> tuple[str, str]:
-        """Generate text using Gemini ONLY."""
+    async def generate_text(self, messages: list, max_tokens: int = 150, cache: bool = True) -> tuple[str, str]:
+        """Generate text using Gemini ONLY; identical requests are served from cache unless cache=False."""
 
         if not self.providers:
             raise Exception(
                 "No Gemini API key configured. Please set GEMINI_API_KEY in .env file.")
 
+        if cache:
+            cache_key = hashlib.blake2b(json.dumps(
+                [messages, max_tokens], sort_keys=True).encode(), digest_size=16).hexdigest()
+            cached = self._response_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < RESPONSE_CACHE_TTL:
+                self._response_cache.move_to_end(cache_key)
+                return cached[1], cached[2]
+
         provider_name, provider = self.providers[0]  # Only Gemini
         try:
-            print(f"🤖 Using {provider_name}...")
-            result = await provider.generate_text(messages, max_tokens)
-            print(f"✅ Success with {provider_name}")
+            logger.debug("Using %s", provider_name)
+            async with self._request_slots:
+                result = await provider.generate_text(messages, max_tokens)
+            logger.debug("Success with %s", provider_name)
+            if cache:
+                self._response_cache[cache_key] = (
+                    time.monotonic(), result, provider_name)
+                self._response_cache.move_to_end(cache_key)
+                if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
             return result, provider_name
         except Exception as e:
-            print(f"❌ {provider_name} failed: {str(e)}")
+            logger.warning("%s failed: %s", provider_name, e)
             raise Exception(f"Gemini API failed: {str(e)}")
 
 
@@ -4,7 +4,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from config import settings
 from database import get_db
 from models import User
@@ -65,11 +65,8 @@ def authenticate_user(db: Session, email: str, password: str):
     return user
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    """Get the current authenticated user from JWT token."""
+def load_user_from_token(credentials: HTTPAuthorizationCredentials, db: Session, *options):
+    """Load the JWT's user, applying any loader options to the same query."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -77,14 +74,32 @@ def get_current_user(
     )
 
     token_data = verify_token(credentials.credentials, credentials_exception)
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = db.query(User).options(*options).filter(
+        User.email == token_data.email).first()
     if user is None:
         raise credentials_exception
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Get the current authenticated user from JWT token."""
+    return load_user_from_token(credentials, db)
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)):
     """Get the current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+def get_current_active_user_with_profile(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Get the current active user with persona_profile joined into the same SELECT."""
+    return get_current_active_user(load_user_from_token(
+        credentials, db, joinedload(User.persona_profile)))
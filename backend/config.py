@@ -7,6 +7,10 @@ class Settings(BaseSettings):
     # Database
     # Default to SQLite for development
     database_url: str = "sqlite:///./mirrorme.db"
+    # Connection pool; analytics endpoints hold a session for their whole
+    # query, so the pool is sized for concurrent clients rather than workers
+    sqlalchemy_pool_size: int = 25
+    sqlalchemy_max_overflow: int = 25
 
     # JWT
     secret_key: str = "your-super-secret-jwt-key-change-this-in-production"
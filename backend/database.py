@@ -1,17 +1,56 @@
-from sqlalchemy import create_engine
+import logging
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
+logger = logging.getLogger("mirrorme.db")
+
+database_url = make_url(settings.database_url)
+
+# In-memory SQLite gets a SingletonThreadPool, which takes no pool sizing;
+# every other URL (server databases, file-backed SQLite) uses a QueuePool
+pool_options = {}
+if database_url.get_backend_name() != "sqlite" or database_url.database not in (None, "", ":memory:"):
+    pool_options = {"pool_size": settings.sqlalchemy_pool_size,
+                    "max_overflow": settings.sqlalchemy_max_overflow}
+
 # Create database engine
 engine = create_engine(
-    settings.database_url,
+    database_url,
     connect_args={
-        "check_same_thread": False} if "sqlite" in settings.database_url else {}
+        "check_same_thread": False} if "sqlite" in settings.database_url else {},
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    **pool_options
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Overflow connections are opened past pool_size and closed on return; seeing
+# them regularly means SQLALCHEMY_POOL_SIZE is too small for the load
+if pool_options:
+    @event.listens_for(engine, "connect")
+    def log_pool_overflow(dbapi_connection, connection_record):
+        if engine.pool.overflow() > 0:
+            logger.warning("Opened overflow connection (%d over pool size %d)",
+                           engine.pool.overflow(), engine.pool.size())
+
+# WAL lets readers run alongside the behavior log writer, and NORMAL sync
+# only fsyncs at checkpoints instead of on every commit
+if settings.database_url.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+# Create session factory; objects stay loaded after commit so returning them
+# doesn't re-select each row
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create base class for models
 Base = declarative_base()
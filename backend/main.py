@@ -1,11 +1,25 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from database import engine, Base
 from config import settings
 from routers import auth, behavior, persona
+from ai_providers import http_client
+from ai_engine import start_analyzer_pool, stop_analyzer_pool
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# App loggers only enqueue records; a listener thread does the blocking
+# stderr writes so request handlers never wait on the stream
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter(
+    "%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_listener = QueueListener(log_queue, log_handler)
+app_logger = logging.getLogger("mirrorme")
+app_logger.addHandler(QueueHandler(log_queue))
+app_logger.propagate = False
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,6 +45,53 @@ app.include_router(behavior.router)
 app.include_router(persona.router)
 
 
+@app.on_event("startup")
+def create_tables():
+    """Create database tables once the worker process is up."""
+    Base.metadata.create_all(bind=engine)
+
+
+@app.on_event("startup")
+async def size_threadpool():
+    """Let sync handlers hold every pooled DB connection at once.
+
+    Sync endpoints and run_in_threadpool share anyio's default limiter of
+    40 threads, which would otherwise cap concurrency below the pool.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = max(
+        40, settings.sqlalchemy_pool_size + settings.sqlalchemy_max_overflow)
+
+
+@app.on_event("startup")
+def start_analyzer_workers():
+    """Start the timeline analysis worker processes."""
+    start_analyzer_pool()
+
+
+@app.on_event("startup")
+def start_log_listener():
+    """Start writing queued log records."""
+    log_listener.start()
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close pooled AI provider connections."""
+    await http_client.aclose()
+
+
+@app.on_event("shutdown")
+def stop_analyzer_workers():
+    """Stop the timeline analysis worker processes."""
+    stop_analyzer_pool()
+
+
+@app.on_event("shutdown")
+def stop_log_listener():
+    """Flush queued log records and stop the listener thread."""
+    log_listener.stop()
+
+
 @app.get("/")
 def read_root():
     """Root endpoint with API information."""
@@ -7,45 +7,31 @@ Adds new fields for political tilt analysis, emotional analysis, and platform-sp
 from models import Base
 from database import engine, get_db
 from config import settings
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Keeps only the newest (highest id) persona profile per user, so the unique
+# idx_persona_profiles_user_id index can be created
+DEDUPE_PERSONA_PROFILES = (
+    "DELETE FROM persona_profiles WHERE id NOT IN "
+    "(SELECT MAX(id) FROM persona_profiles GROUP BY user_id)")
+
 
 def run_migration():
     """Run database migration to add new enhanced fields."""
 
     print("🔄 Starting database migration for enhanced data collection...")
 
-    # SQL commands to add new columns (SQLite compatible)
-    migration_commands = [
-        # Add enhanced content analysis fields
-        "ALTER TABLE behavior_logs ADD COLUMN content TEXT;",
-        "ALTER TABLE behavior_logs ADD COLUMN political_tilt VARCHAR;",
-        "ALTER TABLE behavior_logs ADD COLUMN confidence JSON;",
-
-        # Add platform-specific metadata fields
-        "ALTER TABLE behavior_logs ADD COLUMN author VARCHAR;",
-        "ALTER TABLE behavior_logs ADD COLUMN video_id VARCHAR;",
-        "ALTER TABLE behavior_logs ADD COLUMN channel VARCHAR;",
-
-        # Update existing sentiment column to ensure it exists
-        "ALTER TABLE behavior_logs ADD COLUMN sentiment VARCHAR;",
-
-        # Create indexes for better query performance
-        "CREATE INDEX IF NOT EXISTS idx_behavior_logs_political_tilt ON behavior_logs(political_tilt);",
-        "CREATE INDEX IF NOT EXISTS idx_behavior_logs_sentiment ON behavior_logs(sentiment);",
-        "CREATE INDEX IF NOT EXISTS idx_behavior_logs_behavior_type ON behavior_logs(behavior_type);",
-        "CREATE INDEX IF NOT EXISTS idx_behavior_logs_author ON behavior_logs(author);",
-        "CREATE INDEX IF NOT EXISTS idx_behavior_logs_channel ON behavior_logs(channel);",
-    ]
-
     try:
-        with engine.connect() as connection:
+        # Every ALTER and index goes out as one script inside one transaction.
+        # executescript() commits any pending transaction before it runs, so
+        # the script carries its own BEGIN/COMMIT.
+        with engine.begin() as connection:
             # Check existing columns first
-            result = connection.execute(
-                text("PRAGMA table_info(behavior_logs)"))
+            result = connection.exec_driver_sql(
+                "PRAGMA table_info(behavior_logs)")
             existing_columns = [row[1] for row in result.fetchall()]
 
             # Only add columns that don't exist
@@ -59,28 +45,59 @@ def run_migration():
                 ("sentiment", "VARCHAR")
             ]
 
+            commands = []
             for column_name, column_type in columns_to_add:
                 if column_name not in existing_columns:
-                    command = f"ALTER TABLE behavior_logs ADD COLUMN {column_name} {column_type};"
                     print(f"  Adding column: {column_name}")
-                    connection.execute(text(command))
-                    connection.commit()
+                    commands.append(
+                        f"ALTER TABLE behavior_logs ADD COLUMN {column_name} {column_type};")
                 else:
                     print(f"  Column {column_name} already exists, skipping")
 
+            # Every persona query filters on user_id first, so these columns are
+            # indexed behind it; the old single-column indexes only cost writes
+            drop_index_commands = [
+                "DROP INDEX IF EXISTS idx_behavior_logs_political_tilt;",
+                "DROP INDEX IF EXISTS idx_behavior_logs_sentiment;",
+                "DROP INDEX IF EXISTS idx_behavior_logs_behavior_type;",
+                # Replaced by the partial idx_behavior_logs_user_analyzed_time
+                "DROP INDEX IF EXISTS idx_behavior_logs_user_analysis_time;"
+            ]
+
+            for command in drop_index_commands:
+                print(f"  Dropping index: {command.split()[4].rstrip(';')}")
+            commands.extend(drop_index_commands)
+
+            # The unique user_id index can't be built over duplicate profiles
+            print("  Removing duplicate persona profiles")
+            commands.append(DEDUPE_PERSONA_PROFILES + ";")
+
             # Create indexes
             index_commands = [
-                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_political_tilt ON behavior_logs(political_tilt);",
-                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_sentiment ON behavior_logs(sentiment);",
-                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_behavior_type ON behavior_logs(behavior_type);",
-                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_author ON behavior_logs(author);",
-                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_channel ON behavior_logs(channel);"
+                ("idx_behavior_logs_user_behavior_type",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_user_behavior_type ON behavior_logs(user_id, behavior_type);"),
+                ("idx_behavior_logs_user_political_tilt",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_user_political_tilt ON behavior_logs(user_id, political_tilt);"),
+                ("idx_behavior_logs_user_sentiment",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_user_sentiment ON behavior_logs(user_id, sentiment);"),
+                ("idx_behavior_logs_user_timestamp",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_user_timestamp ON behavior_logs(user_id, timestamp);"),
+                ("idx_behavior_logs_user_analyzed_time",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_user_analyzed_time ON behavior_logs(user_id, timestamp) WHERE include_in_analysis = 1;"),
+                ("idx_behavior_logs_author",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_author ON behavior_logs(author);"),
+                ("idx_behavior_logs_channel",
+                 "CREATE INDEX IF NOT EXISTS idx_behavior_logs_channel ON behavior_logs(channel);"),
+                ("idx_persona_profiles_user_id",
+                 "CREATE UNIQUE INDEX IF NOT EXISTS idx_persona_profiles_user_id ON persona_profiles(user_id);")
             ]
 
-            for command in index_commands:
-                print(f"  Creating index: {command.split()[5]}")
-                connection.execute(text(command))
-                connection.commit()
+            for index_name, command in index_commands:
+                print(f"  Creating index: {index_name}")
+                commands.append(command)
+
+            connection.connection.executescript(
+                "\n".join(["BEGIN;", *commands, "COMMIT;"]))
 
         print("✅ Database migration completed successfully!")
         print("\n🎯 New features enabled:")
@@ -100,25 +117,71 @@ def run_migration():
     return True
 
 
+def run_jsonb_migration():
+    """Convert Postgres JSON columns to JSONB and update behavior log indexes."""
+
+    print("🔄 Converting JSON columns to JSONB...")
+
+    jsonb_columns = {
+        "behavior_logs": ["keywords", "confidence"],
+        "persona_profiles": ["top_topics", "emotional_tone", "interest_map",
+                             "bias_score", "personality_traits"]
+    }
+
+    try:
+        with engine.begin() as connection:
+            for table, columns in jsonb_columns.items():
+                for column_name in columns:
+                    print(f"  Converting column: {table}.{column_name}")
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {table} ALTER COLUMN {column_name} "
+                        f"TYPE JSONB USING {column_name}::jsonb")
+
+            print("  Creating index: idx_behavior_logs_user_analyzed_time")
+            connection.exec_driver_sql(
+                "DROP INDEX IF EXISTS idx_behavior_logs_user_analysis_time")
+            connection.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_user_analyzed_time "
+                "ON behavior_logs (user_id, timestamp) WHERE include_in_analysis")
+
+            print("  Removing duplicate persona profiles")
+            connection.exec_driver_sql(DEDUPE_PERSONA_PROFILES)
+
+            print("  Creating index: idx_persona_profiles_user_id")
+            connection.exec_driver_sql(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_persona_profiles_user_id "
+                "ON persona_profiles (user_id)")
+
+            print("  Creating index: idx_behavior_logs_keywords_gin")
+            connection.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS idx_behavior_logs_keywords_gin "
+                "ON behavior_logs USING gin (keywords)")
+
+        print("✅ JSONB migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ JSONB migration failed: {e}")
+        return False
+
+    return True
+
+
 def verify_migration():
     """Verify that the migration was successful."""
 
     print("\n🔍 Verifying migration...")
 
-    verification_queries = [
-        "SELECT column_name FROM information_schema.columns WHERE table_name = 'behavior_logs' AND column_name = 'political_tilt';",
-        "SELECT column_name FROM information_schema.columns WHERE table_name = 'behavior_logs' AND column_name = 'content';",
-        "SELECT column_name FROM information_schema.columns WHERE table_name = 'behavior_logs' AND column_name = 'author';",
-        "SELECT column_name FROM information_schema.columns WHERE table_name = 'behavior_logs' AND column_name = 'video_id';",
-        "SELECT column_name FROM information_schema.columns WHERE table_name = 'behavior_logs' AND column_name = 'channel';"
-    ]
+    required_columns = ["political_tilt", "content",
+                        "author", "video_id", "channel"]
 
     try:
         with engine.connect() as connection:
-            for query in verification_queries:
-                result = connection.execute(text(query))
-                if not result.fetchone():
-                    print(f"❌ Column not found: {query}")
+            result = connection.exec_driver_sql(
+                "PRAGMA table_info(behavior_logs)")
+            existing_columns = {row[1] for row in result.fetchall()}
+            for column_name in required_columns:
+                if column_name not in existing_columns:
+                    print(f"❌ Column not found: {column_name}")
                     return False
 
         print("✅ All new columns verified successfully!")
@@ -133,6 +196,10 @@ if __name__ == "__main__":
     print("🪞 MirrorMe Enhanced Data Collection Migration")
     print("=" * 50)
 
+    # Postgres tables come from create_all; they only need the JSONB upgrade
+    if engine.dialect.name == "postgresql":
+        sys.exit(0 if run_jsonb_migration() else 1)
+
     # Run migration
     if run_migration():
         # Verify migration
@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from database import Base
 
+# Postgres stores these as binary JSONB (no re-parse on read, indexable);
+# other databases keep the generic JSON type
+JSONType = JSON().with_variant(JSONB, "postgresql")
+
 
 class User(Base):
     __tablename__ = "users"
@@ -16,29 +21,39 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    personas = relationship("PersonaProfile", back_populates="user")
-    behavior_logs = relationship("BehaviorLog", back_populates="user")
+    personas = relationship("PersonaProfile", back_populates="user", lazy="raise")
+    # The same profile as a scalar (user_id is unique); persona routes
+    # joinedload it with the user
+    persona_profile = relationship(
+        "PersonaProfile", uselist=False, viewonly=True, lazy="raise")
+    behavior_logs = relationship(
+        "BehaviorLog", back_populates="user", lazy="raise")
 
 
 class PersonaProfile(Base):
     __tablename__ = "persona_profiles"
+    # One profile per user; the profile endpoint's ON CONFLICT insert relies
+    # on it. Keep in sync with migrate_db.py
+    __table_args__ = (
+        Index("idx_persona_profiles_user_id", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Core persona data (metadata only, not raw logs)
     # ["technology", "health", "finance"]
-    top_topics = Column(JSON, default=list)
+    top_topics = Column(JSONType, default=list)
     # {"positive": 0.7, "neutral": 0.2, "negative": 0.1}
-    emotional_tone = Column(JSON, default=dict)
-    interest_map = Column(JSON, default=dict)  # Network graph of interests
+    emotional_tone = Column(JSONType, default=dict)
+    interest_map = Column(JSONType, default=dict)  # Network graph of interests
     # Detected biases and growth patterns
-    bias_score = Column(JSON, default=dict)
+    bias_score = Column(JSONType, default=dict)
 
     # AI-generated insights
     persona_summary = Column(Text, nullable=True)  # Natural language summary
     # ["curious", "analytical", "health-conscious"]
-    personality_traits = Column(JSON, default=list)
+    personality_traits = Column(JSONType, default=list)
 
     # Metadata
     last_analysis = Column(DateTime(timezone=True), nullable=True)
@@ -47,11 +62,23 @@ class PersonaProfile(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="personas")
+    user = relationship("User", back_populates="personas", lazy="raise")
 
 
 class BehaviorLog(Base):
     __tablename__ = "behavior_logs"
+    # Every log listing and analytics window filters by user, then by time;
+    # analytics only read included logs, so their index skips excluded rows.
+    # Keep in sync with migrate_db.py
+    __table_args__ = (
+        Index("idx_behavior_logs_user_timestamp", "user_id", "timestamp"),
+        Index("idx_behavior_logs_user_analyzed_time", "user_id", "timestamp",
+              postgresql_where=text("include_in_analysis"),
+              sqlite_where=text("include_in_analysis = 1")),
+        # Lets keyword containment filters (keywords @> '["ai"]') use an index
+        Index("idx_behavior_logs_keywords_gin", "keywords",
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -64,7 +91,7 @@ class BehaviorLog(Base):
     # "search", "visit", "tweet_view", "youtube_video_watch", etc.
     behavior_type = Column(String, nullable=False)
     category = Column(String, nullable=True)  # "technology", "health", etc.
-    keywords = Column(JSON, default=list)  # Extracted keywords only
+    keywords = Column(JSONType, default=list)  # Extracted keywords only
 
     # Enhanced content analysis
     # Limited content for analysis (280 chars for tweets)
@@ -73,7 +100,7 @@ class BehaviorLog(Base):
     sentiment = Column(String, nullable=True)
     # "left", "right", "neutral"
     political_tilt = Column(String, nullable=True)
-    confidence = Column(JSON, nullable=True)  # Confidence score for analysis
+    confidence = Column(JSONType, nullable=True)  # Confidence score for analysis
 
     # Platform-specific metadata
     author = Column(String, nullable=True)  # Tweet author, channel name, etc.
@@ -89,7 +116,19 @@ class BehaviorLog(Base):
     include_in_analysis = Column(Boolean, default=True)  # User can exclude
 
     # Relationships
-    user = relationship("User", back_populates="behavior_logs")
+    user = relationship("User", back_populates="behavior_logs", lazy="raise")
+
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # "pending", "completed", "failed"
+    status = Column(String, nullable=False, default="pending")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
 
 
 class DataExport(Base):
@@ -29,9 +29,9 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password,
         full_name=user.full_name
     )
+    # id and created_at come back via INSERT ... RETURNING
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
 
     return db_user
 
@@ -1,17 +1,83 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import Counter, OrderedDict
+from operator import attrgetter
+import logging
+import threading
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert, update
 from sqlalchemy.orm import Session
 from database import get_db
 from models import User, BehaviorLog
-from schemas import BehaviorLogCreate, BehaviorLogBatch, BehaviorLog as BehaviorLogSchema
+from schemas import BehaviorLogCreate, BehaviorLogBatch, BehaviorLog as BehaviorLogSchema, PerceiverType
 from auth import get_current_active_user, get_current_user
-from ai_engine import persona_analyzer
+from ai_engine import TIMELINE_COLUMNS, persona_analyzer, run_pooled_analysis
+
+logger = logging.getLogger("mirrorme.behavior")
 
 security = HTTPBearer()
 
 router = APIRouter(prefix="/behavior", tags=["behavior"])
 
+# Validates log rows and dumps them to JSON bytes in one pydantic-core pass;
+# response_model would build an intermediate list of dicts for json.dumps
+log_list_adapter = TypeAdapter(List[BehaviorLogSchema])
+
+
+def log_list_response(logs: List[BehaviorLog]) -> Response:
+    """Serialize behavior logs as a BehaviorLogSchema JSON list."""
+    return Response(
+        log_list_adapter.dump_json(log_list_adapter.validate_python(logs)),
+        media_type="application/json")
+
+
+# Upper bound on one page of GET /logs, so a single request can't load a
+# user's whole history into memory
+MAX_LOGS_PAGE_SIZE = 500
+
+# Dashboard polling repeats the same analytics; results are reused for this
+# long while the user's analyzable logs are unchanged
+ANALYTICS_CACHE_TTL = 60
+ANALYTICS_CACHE_SIZE = 1024
+
+# (compute name, user id, days_back, watermark) -> (computed at, result), and
+# ("persona_profile", watermark) for the perception endpoints. Handlers run in
+# the threadpool, so access is serialized.
+analytics_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+analytics_cache_lock = threading.Lock()
+
+
+def cached_analytics(compute: Callable[[Session, int, int], Dict[str, Any]],
+                     db: Session, user_id: int, days_back: int) -> Dict[str, Any]:
+    """Return compute(db, user_id, days_back), reusing a recent identical result.
+
+    The key includes the newest log id and the count of analyzable logs, so
+    new, deleted or re-included logs miss the cache; the TTL bounds how long a
+    result can trail the sliding days_back window.
+    """
+    watermark = tuple(db.query(func.max(BehaviorLog.id), func.count()).filter(
+        BehaviorLog.user_id == user_id,
+        BehaviorLog.include_in_analysis == True
+    ).one())
+    key = (compute.__name__, user_id, days_back, watermark)
+
+    with analytics_cache_lock:
+        cached = analytics_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL:
+            analytics_cache.move_to_end(key)
+            return cached[1]
+
+    result = compute(db, user_id, days_back)
+    with analytics_cache_lock:
+        analytics_cache[key] = (time.monotonic(), result)
+        analytics_cache.move_to_end(key)
+        if len(analytics_cache) > ANALYTICS_CACHE_SIZE:
+            analytics_cache.popitem(last=False)
+    return result
+
 
 @router.post("/log", response_model=BehaviorLogSchema)
 def log_behavior(
@@ -24,9 +90,9 @@ def log_behavior(
         user_id=current_user.id,
         **behavior_data.dict()
     )
+    # id and the server timestamp come back via INSERT ... RETURNING
     db.add(db_behavior)
     db.commit()
-    db.refresh(db_behavior)
 
     return db_behavior
 
@@ -38,38 +104,48 @@ def log_behavior_batch(
     db: Session = Depends(get_db)
 ):
     """Log multiple behavior events in batch."""
-    db_behaviors = []
-
-    for behavior_data in batch_data.logs:
-        db_behavior = BehaviorLog(
-            user_id=current_user.id,
-            **behavior_data.dict()
-        )
-        db.add(db_behavior)
-        db_behaviors.append(db_behavior)
-
+    rows = [{"user_id": current_user.id, **behavior_data.dict()}
+            for behavior_data in batch_data.logs]
+    if not rows:
+        return log_list_response([])
+
+    # One multi-row INSERT ... RETURNING fills ids and server timestamps,
+    # instead of an INSERT plus a refresh SELECT per log. render_nulls keeps
+    # rows with different None fields in the same statement (the schema has
+    # no server-defaulted fields). RETURNING order is unspecified and asking
+    # SQLite for it falls back to row-at-a-time inserts, so restore request
+    # order from the sequential ids instead
+    db_behaviors = db.scalars(
+        insert(BehaviorLog).returning(BehaviorLog).execution_options(
+            render_nulls=True), rows).all()
     db.commit()
 
-    # Refresh all objects
-    for db_behavior in db_behaviors:
-        db.refresh(db_behavior)
-
-    return db_behaviors
+    return log_list_response(sorted(db_behaviors, key=attrgetter("id")))
 
 
 @router.get("/logs", response_model=List[BehaviorLogSchema])
 def get_behavior_logs(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_LOGS_PAGE_SIZE),
+    after_id: Optional[int] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get user's behavior logs."""
-    logs = db.query(BehaviorLog).filter(
+    """Get user's behavior logs.
+
+    Pass the last id of a page as after_id to fetch the next one; unlike skip,
+    that seeks straight to the page instead of walking every earlier row.
+    """
+    query = db.query(BehaviorLog).filter(
         BehaviorLog.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    )
+    if after_id is not None:
+        query = query.filter(BehaviorLog.id > after_id)
+
+    # Explicit order keeps pages stable whichever user index the planner picks
+    logs = query.order_by(BehaviorLog.id).offset(skip).limit(limit).all()
 
-    return logs
+    return log_list_response(logs)
 
 
 @router.put("/logs/{log_id}/sensitivity")
@@ -80,15 +156,15 @@ def update_log_sensitivity(
     db: Session = Depends(get_db)
 ):
     """Update sensitivity flag for a behavior log."""
-    log = db.query(BehaviorLog).filter(
+    # One UPDATE scoped to the owner; no match means no such log for this user
+    result = db.execute(update(BehaviorLog).where(
         BehaviorLog.id == log_id,
         BehaviorLog.user_id == current_user.id
-    ).first()
+    ).values(is_sensitive=is_sensitive))
 
-    if not log:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Behavior log not found")
 
-    log.is_sensitive = is_sensitive
     db.commit()
 
     return {"message": "Sensitivity updated successfully"}
@@ -102,15 +178,14 @@ def update_log_analysis_inclusion(
     db: Session = Depends(get_db)
 ):
     """Update whether a log should be included in analysis."""
-    log = db.query(BehaviorLog).filter(
+    result = db.execute(update(BehaviorLog).where(
         BehaviorLog.id == log_id,
         BehaviorLog.user_id == current_user.id
-    ).first()
+    ).values(include_in_analysis=include_in_analysis))
 
-    if not log:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Behavior log not found")
 
-    log.include_in_analysis = include_in_analysis
     db.commit()
 
     return {"message": "Analysis inclusion updated successfully"}
@@ -123,15 +198,14 @@ def delete_behavior_log(
     db: Session = Depends(get_db)
 ):
     """Delete a behavior log."""
-    log = db.query(BehaviorLog).filter(
+    result = db.execute(delete(BehaviorLog).where(
         BehaviorLog.id == log_id,
         BehaviorLog.user_id == current_user.id
-    ).first()
+    ))
 
-    if not log:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Behavior log not found")
 
-    db.delete(log)
     db.commit()
 
     return {"message": "Behavior log deleted successfully"}
@@ -144,18 +218,26 @@ def get_enhanced_analytics(
     db: Session = Depends(get_db)
 ):
     """Get enhanced analytics including political tilt and platform behavior."""
+    return cached_analytics(compute_enhanced_analytics, db, current_user.id, days_back)
+
+
+def compute_enhanced_analytics(db: Session, user_id: int, days_back: int) -> Dict[str, Any]:
+    """Build the enhanced analytics payload for a user's recent logs."""
     from datetime import datetime, timedelta
 
     # Get behavior logs from specified time period
     cutoff_date = datetime.utcnow() - timedelta(days=days_back)
 
-    behavior_logs = db.query(BehaviorLog).filter(
-        BehaviorLog.user_id == current_user.id,
+    query = db.query(BehaviorLog).filter(
+        BehaviorLog.user_id == user_id,
         BehaviorLog.timestamp >= cutoff_date,
         BehaviorLog.include_in_analysis == True
-    ).all()
+    )
 
-    if not behavior_logs:
+    # Counts are grouped in the database; no log rows are loaded
+    analytics = persona_analyzer.analyze_enhanced_activity(query)
+
+    if not analytics["data_points"]:
         return {
             "political_tilt": {"neutral": 1.0},
             "platform_behavior": {},
@@ -164,30 +246,8 @@ def get_enhanced_analytics(
             "data_points": 0
         }
 
-    # Analyze political tilt distribution
-    political_dist = persona_analyzer.analyze_political_tilt_distribution(
-        behavior_logs)
-    sentiment_dist = persona_analyzer.analyze_sentiment_distribution(
-        behavior_logs)
-    platform_analysis = persona_analyzer.analyze_platform_behavior(
-        behavior_logs)
-
-    # Calculate engagement patterns
-    engagement_patterns = {
-        "searches": len([log for log in behavior_logs if log.behavior_type == "search"]),
-        "social_interactions": len([log for log in behavior_logs if log.behavior_type.startswith('tweet_')]),
-        "video_consumption": len([log for log in behavior_logs if log.behavior_type.startswith('youtube_')]),
-        "total_sessions": len(behavior_logs)
-    }
-
-    return {
-        "political_tilt": political_dist,
-        "platform_behavior": platform_analysis,
-        "sentiment_distribution": sentiment_dist,
-        "engagement_patterns": engagement_patterns,
-        "data_points": len(behavior_logs),
-        "analysis_period_days": days_back
-    }
+    analytics["analysis_period_days"] = days_back
+    return analytics
 
 
 @router.post("/log-instagram", response_model=dict)
@@ -200,44 +260,38 @@ def log_instagram_data(
     # This endpoint is prepared for when Instagram API access is available
     # For now, it can accept manually exported data or future API integration
 
-    processed_logs = []
-
-    if "likes" in instagram_data:
-        for like in instagram_data["likes"]:
-            # Process Instagram likes into behavior logs
-            db_behavior = BehaviorLog(
-                user_id=current_user.id,
-                source="instagram_api",
-                behavior_type="instagram_like",
-                category="social",
-                keywords=like.get("hashtags", []),
-                content=like.get("caption", "")[:280],  # Limit content
-                sentiment="positive",  # Likes are generally positive engagement
-                author=like.get("author"),
-                timestamp=like.get("timestamp")
-            )
-            db.add(db_behavior)
-            processed_logs.append(db_behavior)
-
-    if "story_views" in instagram_data:
-        for story in instagram_data["story_views"]:
-            db_behavior = BehaviorLog(
-                user_id=current_user.id,
-                source="instagram_api",
-                behavior_type="instagram_story_view",
-                category="social",
-                keywords=story.get("hashtags", []),
-                author=story.get("author"),
-                timestamp=story.get("timestamp")
-            )
-            db.add(db_behavior)
-            processed_logs.append(db_behavior)
-
-    db.commit()
+    like_rows = [
+        dict(user_id=current_user.id,
+             source="instagram_api",
+             behavior_type="instagram_like",
+             category="social",
+             keywords=like.get("hashtags", []),
+             content=(like.get("caption") or "")[:280],  # Limit content
+             sentiment="positive",  # Likes are generally positive engagement
+             author=like.get("author"),
+             timestamp=like.get("timestamp"))
+        for like in instagram_data.get("likes", [])
+    ]
+    story_rows = [
+        dict(user_id=current_user.id,
+             source="instagram_api",
+             behavior_type="instagram_story_view",
+             category="social",
+             keywords=story.get("hashtags", []),
+             author=story.get("author"),
+             timestamp=story.get("timestamp"))
+        for story in instagram_data.get("story_views", [])
+    ]
+
+    # Multi-row INSERTs instead of one flushed INSERT per like and story view
+    logs_created = len(like_rows) + len(story_rows)
+    if logs_created:
+        db.execute(insert(BehaviorLog), like_rows + story_rows)
+        db.commit()
 
     return {
-        "message": f"Processed {len(processed_logs)} Instagram data points",
-        "logs_created": len(processed_logs)
+        "message": f"Processed {logs_created} Instagram data points",
+        "logs_created": logs_created
     }
 
 
@@ -248,33 +302,36 @@ def get_digital_avatars(
     db: Session = Depends(get_db)
 ):
     """Get digital avatars - different personality versions based on platform behavior."""
+    return cached_analytics(compute_digital_avatars, db, current_user.id, days_back)
+
+
+def compute_digital_avatars(db: Session, user_id: int, days_back: int) -> Dict[str, Any]:
+    """Build the digital avatars payload for a user's recent logs."""
     from datetime import datetime, timedelta
 
     # Get behavior logs from specified time period
     cutoff_date = datetime.utcnow() - timedelta(days=days_back)
 
-    behavior_logs = db.query(BehaviorLog).filter(
-        BehaviorLog.user_id == current_user.id,
+    query = db.query(BehaviorLog).filter(
+        BehaviorLog.user_id == user_id,
         BehaviorLog.timestamp >= cutoff_date,
         BehaviorLog.include_in_analysis == True
-    ).all()
+    )
 
-    if not behavior_logs:
+    # Counts are grouped in the database; only keyword columns are streamed
+    analysis = persona_analyzer.analyze_digital_avatars(query)
+
+    if not analysis["data_points"]:
         return {
             "digital_avatars": [],
             "message": "No behavior data available. Start browsing with the extension to generate your digital avatars.",
             "data_points": 0
         }
 
-    # Analyze platform behavior and generate avatars
-    platform_analysis = persona_analyzer.analyze_platform_behavior(
-        behavior_logs)
-    digital_avatars = persona_analyzer.generate_digital_avatars(
-        behavior_logs, platform_analysis)
-
+    digital_avatars = analysis["digital_avatars"]
     return {
         "digital_avatars": digital_avatars,
-        "data_points": len(behavior_logs),
+        "data_points": analysis["data_points"],
         "analysis_period_days": days_back,
         "total_avatars": len(digital_avatars)
     }
@@ -287,13 +344,18 @@ def get_algorithm_influence_analysis(
     db: Session = Depends(get_db)
 ):
     """Get algorithm influence timeline analysis showing bias trends and manipulation patterns."""
+    return cached_analytics(compute_algorithm_influence, db, current_user.id, days_back)
+
+
+def compute_algorithm_influence(db: Session, user_id: int, days_back: int) -> Dict[str, Any]:
+    """Build the algorithm influence timeline for a user's recent logs."""
     from datetime import datetime, timedelta
 
     # Get behavior logs from specified time period
     cutoff_date = datetime.utcnow() - timedelta(days=days_back)
 
-    behavior_logs = db.query(BehaviorLog).filter(
-        BehaviorLog.user_id == current_user.id,
+    behavior_logs = db.query(*TIMELINE_COLUMNS).filter(
+        BehaviorLog.user_id == user_id,
         BehaviorLog.timestamp >= cutoff_date,
         BehaviorLog.include_in_analysis == True
     ).all()
@@ -317,8 +379,8 @@ def get_algorithm_influence_analysis(
         }
 
     # Perform algorithm influence timeline analysis
-    influence_analysis = persona_analyzer.analyze_algorithm_influence_timeline(
-        behavior_logs, days_back)
+    influence_analysis = run_pooled_analysis(
+        "analyze_algorithm_influence_timeline", behavior_logs, days_back)
 
     return influence_analysis
 
@@ -330,13 +392,18 @@ def get_topic_bias_analysis(
     db: Session = Depends(get_db)
 ):
     """Analyze what topics algorithms are pushing towards the user and detect bias patterns."""
+    return cached_analytics(compute_topic_bias, db, current_user.id, days_back)
+
+
+def compute_topic_bias(db: Session, user_id: int, days_back: int) -> Dict[str, Any]:
+    """Build the topic bias analysis for a user's recent logs."""
     from datetime import datetime, timedelta
 
     # Get behavior logs from specified time period
     cutoff_date = datetime.utcnow() - timedelta(days=days_back)
 
-    behavior_logs = db.query(BehaviorLog).filter(
-        BehaviorLog.user_id == current_user.id,
+    behavior_logs = db.query(*TIMELINE_COLUMNS).filter(
+        BehaviorLog.user_id == user_id,
         BehaviorLog.timestamp >= cutoff_date,
         BehaviorLog.include_in_analysis == True
     ).all()
@@ -353,26 +420,67 @@ def get_topic_bias_analysis(
         }
 
     # Perform topic bias detection analysis
-    bias_analysis = persona_analyzer.analyze_topic_bias_detection(
-        behavior_logs, days_back)
+    bias_analysis = run_pooled_analysis(
+        "analyze_topic_bias_detection", behavior_logs, days_back)
 
     return bias_analysis
 
 
-@router.get("/analytics/perception-analysis/{perceiver_type}")
+def recent_behavior_logs(credentials: HTTPAuthorizationCredentials, db: Session) -> Tuple[Tuple[int, Any, int], List[BehaviorLog]]:
+    """Authenticate and load the latest 1000 logs for the perception endpoints.
+
+    Also returns a (user id, newest log id, log count) watermark for
+    cached_persona_profile. These handlers are async, so the blocking session
+    work is run through run_in_threadpool rather than on the event loop.
+    """
+    current_user = get_current_user(credentials, db)
+    watermark = (current_user.id, *db.query(
+        func.max(BehaviorLog.id), func.count()
+    ).filter(BehaviorLog.user_id == current_user.id).one())
+    behavior_logs = db.query(BehaviorLog).filter(
+        BehaviorLog.user_id == current_user.id
+    ).order_by(BehaviorLog.timestamp.desc()).limit(1000).all()
+    return watermark, behavior_logs
+
+
+async def cached_persona_profile(watermark: Tuple[int, Any, int],
+                                 behavior_logs: List[BehaviorLog]) -> Dict[str, Any]:
+    """Return the persona profile for these logs, shared by the perception endpoints.
+
+    Dashboards poll all three endpoints with unchanged logs; the watermark
+    changes whenever a log is added or deleted, so only the summary's AI call
+    and aggregation for a new log set are ever repeated.
+    """
+    key = ("persona_profile", watermark)
+    with analytics_cache_lock:
+        cached = analytics_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL:
+            analytics_cache.move_to_end(key)
+            return cached[1]
+
+    persona_profile = await persona_analyzer.generate_persona_profile(behavior_logs)
+    with analytics_cache_lock:
+        analytics_cache[key] = (time.monotonic(), persona_profile)
+        analytics_cache.move_to_end(key)
+        if len(analytics_cache) > ANALYTICS_CACHE_SIZE:
+            analytics_cache.popitem(last=False)
+    return persona_profile
+
+
+@router.get("/analytics/perception-analysis/{perceiver_type}", response_model=dict)
 async def get_perception_analysis(
-    perceiver_type: str,
+    perceiver_type: PerceiverType,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """Get perception analysis from a specific viewpoint (recruiter, romantic_partner, colleague, family_member)."""
+    # FastAPI has already rejected unknown viewpoints with a 422 before any
+    # query runs; the analyzer's tables are keyed by the plain string
+    perceiver_type = perceiver_type.value
     try:
-        current_user = get_current_user(credentials, db)
-
         # Get behavior logs for analysis
-        behavior_logs = db.query(BehaviorLog).filter(
-            BehaviorLog.user_id == current_user.id
-        ).order_by(BehaviorLog.timestamp.desc()).limit(1000).all()
+        watermark, behavior_logs = await run_in_threadpool(
+            recent_behavior_logs, credentials, db)
 
         if not behavior_logs:
             return {
@@ -383,10 +491,11 @@ async def get_perception_analysis(
             }
 
         # Get persona profile for context
-        persona_profile = await persona_analyzer.generate_persona_profile(behavior_logs)
+        persona_profile = await cached_persona_profile(watermark, behavior_logs)
 
         # Generate perception analysis
-        perception_data = persona_analyzer.generate_perception_analysis(
+        perception_data = await run_in_threadpool(
+            persona_analyzer.generate_perception_analysis,
             behavior_logs, persona_profile, perceiver_type
         )
 
@@ -396,25 +505,24 @@ async def get_perception_analysis(
 
         return perception_data
 
-    except Exception as e:
-        print(f"Error in perception analysis: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Perception analysis failed for %s", perceiver_type)
         raise HTTPException(
             status_code=500, detail="Failed to generate perception analysis")
 
 
-@router.get("/analytics/perception-comparison")
+@router.get("/analytics/perception-comparison", response_model=dict)
 async def get_perception_comparison(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """Get comparison of how different types of people perceive the user."""
     try:
-        current_user = get_current_user(credentials, db)
-
         # Get behavior logs for analysis
-        behavior_logs = db.query(BehaviorLog).filter(
-            BehaviorLog.user_id == current_user.id
-        ).order_by(BehaviorLog.timestamp.desc()).limit(1000).all()
+        watermark, behavior_logs = await run_in_threadpool(
+            recent_behavior_logs, credentials, db)
 
         if not behavior_logs:
             return {
@@ -423,23 +531,21 @@ async def get_perception_comparison(
             }
 
         # Get persona profile once
-        persona_profile = await persona_analyzer.generate_persona_profile(behavior_logs)
+        persona_profile = await cached_persona_profile(watermark, behavior_logs)
 
         # Generate perception analysis for different viewpoints
         perceiver_types = ["recruiter", "romantic_partner",
                            "colleague", "family_member"]
-        perceptions = {}
-
-        for perceiver_type in perceiver_types:
-            perception_data = persona_analyzer.generate_perception_analysis(
-                behavior_logs, persona_profile, perceiver_type
-            )
-
-            # Add AI feedback for each perspective
-            ai_feedback = await persona_analyzer.generate_ai_perception_feedback(perception_data, behavior_logs)
-            perception_data["ai_feedback"] = ai_feedback
+        perceptions = await run_in_threadpool(
+            persona_analyzer.generate_perception_analyses,
+            behavior_logs, persona_profile, perceiver_types
+        )
 
-            perceptions[perceiver_type] = perception_data
+        # Add AI feedback for each perspective
+        ai_feedbacks = await persona_analyzer.generate_ai_perception_feedbacks(
+            perceptions, behavior_logs)
+        for perceiver_type, perception_data in perceptions.items():
+            perception_data["ai_feedback"] = ai_feedbacks[perceiver_type]
 
         # Calculate overall summary
         all_scores = []
@@ -462,25 +568,24 @@ async def get_perception_comparison(
             }
         }
 
-    except Exception as e:
-        print(f"Error in perception comparison: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Perception comparison failed")
         raise HTTPException(
             status_code=500, detail="Failed to generate perception comparison")
 
 
-@router.get("/analytics/perception-recommendations")
+@router.get("/analytics/perception-recommendations", response_model=dict)
 async def get_perception_recommendations(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """Get actionable recommendations for improving online perception across all viewpoints."""
     try:
-        current_user = get_current_user(credentials, db)
-
         # Get behavior logs for analysis
-        behavior_logs = db.query(BehaviorLog).filter(
-            BehaviorLog.user_id == current_user.id
-        ).order_by(BehaviorLog.timestamp.desc()).limit(1000).all()
+        watermark, behavior_logs = await run_in_threadpool(
+            recent_behavior_logs, credentials, db)
 
         if not behavior_logs:
             return {
@@ -493,19 +598,19 @@ async def get_perception_recommendations(
             }
 
         # Get persona profile
-        persona_profile = await persona_analyzer.generate_persona_profile(behavior_logs)
+        persona_profile = await cached_persona_profile(watermark, behavior_logs)
 
         # Analyze all perception types to gather comprehensive recommendations
         perceiver_types = ["recruiter", "romantic_partner",
                            "colleague", "family_member"]
         all_recommendations = set()
-        concern_counts = {}
-
-        for perceiver_type in perceiver_types:
-            perception_data = persona_analyzer.generate_perception_analysis(
-                behavior_logs, persona_profile, perceiver_type
-            )
+        concern_counts = Counter()
+        perceptions = await run_in_threadpool(
+            persona_analyzer.generate_perception_analyses,
+            behavior_logs, persona_profile, perceiver_types
+        )
 
+        for perception_data in perceptions.values():
             # Collect recommendations
             recommendations = perception_data.get("recommendations", [])
             for rec in recommendations:
@@ -514,12 +619,10 @@ async def get_perception_recommendations(
             # Count concerns across viewpoints
             concerns = perception_data.get("concerns", []) + perception_data.get(
                 "potential_concerns", []) + perception_data.get("red_flags", [])
-            for concern in concerns:
-                concern_counts[concern] = concern_counts.get(concern, 0) + 1
+            concern_counts.update(concerns)
 
         # Prioritize recommendations based on frequency and impact
-        top_concerns = sorted(concern_counts.items(),
-                              key=lambda x: x[1], reverse=True)[:3]
+        top_concerns = concern_counts.most_common(3)
 
         # Generate personalized action plan
         action_plan = []
@@ -570,7 +673,9 @@ async def get_perception_recommendations(
             }
         }
 
-    except Exception as e:
-        print(f"Error in perception recommendations: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Perception recommendations failed")
         raise HTTPException(
             status_code=500, detail="Failed to generate perception recommendations")
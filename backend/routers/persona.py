@@ -1,34 +1,109 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import logging
+import threading
+import time
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from database import get_db
-from models import User, PersonaProfile
+from database import SessionLocal, get_db
+from models import User, PersonaProfile, BehaviorLog, AnalysisJob
 from schemas import (
     PersonaProfile as PersonaProfileSchema,
     PersonaProfileUpdate,
     PersonaAnalysisRequest,
-    PersonaAnalysisResponse
+    PersonaAnalysisResponse,
+    AnalysisJob as AnalysisJobSchema
 )
-from auth import get_current_active_user
+from auth import get_current_active_user, get_current_active_user_with_profile
 from ai_engine import persona_analyzer
-from datetime import datetime
+from datetime import datetime, timezone
+
+logger = logging.getLogger("mirrorme.persona")
 
 router = APIRouter(prefix="/persona", tags=["persona"])
 
+# Validates a profile row and dumps it to JSON bytes in one pydantic-core
+# pass, skipping response_model's intermediate dict and json.dumps
+profile_adapter = TypeAdapter(PersonaProfileSchema)
+
+
+def profile_response(profile: PersonaProfile) -> Response:
+    """Serialize a persona profile as PersonaProfileSchema JSON."""
+    return Response(
+        profile_adapter.dump_json(profile_adapter.validate_python(profile)),
+        media_type="application/json")
+
+
+# Dialect INSERTs that support ON CONFLICT, by engine dialect name
+CONFLICT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Whether persona_profiles has the unique user_id index ON CONFLICT needs.
+# create_all doesn't add indexes to existing tables, so databases created
+# before it lack the index until migrate_db.py runs; checked once per process.
+profile_user_index_unique: Optional[bool] = None
+
+
+def can_insert_profile_on_conflict(db: Session) -> bool:
+    """Whether a missing profile can be created with one ON CONFLICT insert."""
+    global profile_user_index_unique
+    bind = db.get_bind()
+    if bind.dialect.name not in CONFLICT_INSERTS:
+        return False
+
+    if profile_user_index_unique is None:
+        profile_user_index_unique = any(
+            index["unique"] and index["column_names"] == ["user_id"]
+            for index in inspect(bind).get_indexes(PersonaProfile.__tablename__))
+    return profile_user_index_unique
+
+# Re-running an analysis over unchanged logs reuses the previous result
+# instead of repeating the aggregation and the AI summary call
+ANALYSIS_CACHE_TTL = 300
+ANALYSIS_CACHE_SIZE = 1024
+
+# (user id, days_back, include_sensitive, watermark) -> (computed at, result).
+# Requests run on the event loop and in the threadpool, so access is locked.
+analysis_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+analysis_cache_lock = threading.Lock()
+
+# Same keys -> task running the analysis for them, so concurrent identical
+# requests share one run; only touched on the event loop
+analysis_inflight: Dict[Tuple, "asyncio.Task[Dict[str, Any]]"] = {}
+
+
+def analysis_watermark(db: Session, user_id: int) -> Tuple[Any, int, int]:
+    """Newest analyzable log id, their count and how many are sensitive.
+
+    Adding, deleting, excluding or re-flagging a log changes at least one of
+    these, so a cached analysis never outlives the logs it was built from.
+    """
+    return tuple(db.query(
+        func.max(BehaviorLog.id),
+        func.count(),
+        func.count().filter(BehaviorLog.is_sensitive == True)
+    ).filter(
+        BehaviorLog.user_id == user_id,
+        BehaviorLog.include_in_analysis == True
+    ).one())
+
 
 @router.get("/profile", response_model=PersonaProfileSchema)
 def get_persona_profile(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_active_user_with_profile),
     db: Session = Depends(get_db)
 ):
     """Get user's current persona profile."""
-    profile = db.query(PersonaProfile).filter(
-        PersonaProfile.user_id == current_user.id
-    ).first()
+    profile = current_user.persona_profile
 
     if not profile:
         # Create empty profile if none exists
-        profile = PersonaProfile(
+        empty_profile = dict(
             user_id=current_user.id,
             top_topics=[],
             emotional_tone={},
@@ -36,36 +111,199 @@ def get_persona_profile(
             bias_score={},
             personality_traits=[]
         )
-        db.add(profile)
-        db.commit()
-        db.refresh(profile)
 
-    return profile
+        if can_insert_profile_on_conflict(db):
+            # RETURNING hands back the row with its server defaults, and a
+            # concurrent first visit that already created it is a no-op
+            # rather than a duplicate
+            insert = CONFLICT_INSERTS[db.get_bind().dialect.name]
+            profile = db.scalars(insert(PersonaProfile).values(
+                **empty_profile
+            ).on_conflict_do_nothing(
+                index_elements=["user_id"]
+            ).returning(PersonaProfile)).first()
+            db.commit()
+
+            if not profile:
+                profile = db.query(PersonaProfile).filter(
+                    PersonaProfile.user_id == current_user.id
+                ).one()
+        else:
+            profile = PersonaProfile(**empty_profile)
+            db.add(profile)
+            db.commit()
+            db.refresh(profile)
+
+    return profile_response(profile)
 
 
 @router.post("/analyze", response_model=PersonaAnalysisResponse)
 async def analyze_persona(
     analysis_request: PersonaAnalysisRequest,
+    background_tasks: BackgroundTasks,
+    background: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Perform AI analysis of user's behavior to generate persona insights."""
-
-    # Run AI analysis
-    analysis_result = await persona_analyzer.analyze_user_persona(
-        db=db,
-        user_id=current_user.id,
-        days_back=analysis_request.days_back,
-        include_sensitive=analysis_request.include_sensitive
+    """Perform AI analysis of user's behavior to generate persona insights.
+
+    With background=true the analysis runs after the response: a pending
+    job is returned at once, its status is polled at /analyze/{job_id} and
+    the results land on the persona profile.
+    """
+    if background:
+        job = await run_in_threadpool(create_analysis_job, db, current_user.id)
+        background_tasks.add_task(
+            run_analysis_job, job.id, current_user.id, analysis_request)
+        return JSONResponse(status_code=202, content={
+            "job_id": job.id, "status": job.status})
+
+    analysis_result = await run_persona_analysis(
+        db, current_user.id, analysis_request)
+
+    return PersonaAnalysisResponse(
+        persona_summary=analysis_result["persona_summary"],
+        top_topics=analysis_result["top_topics"],
+        personality_traits=analysis_result["personality_traits"],
+        emotional_tone=analysis_result["emotional_tone"],
+        insights=analysis_result["insights"],
+        data_points_analyzed=analysis_result["data_points_analyzed"]
     )
 
+
+@router.get("/analyze/{job_id}", response_model=AnalysisJobSchema)
+def get_analysis_job(
+    job_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the status of a background persona analysis."""
+    job = db.query(AnalysisJob).filter(
+        AnalysisJob.id == job_id,
+        AnalysisJob.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+
+    return job
+
+
+async def run_persona_analysis(db: Session, user_id: int,
+                               analysis_request: PersonaAnalysisRequest) -> Dict[str, Any]:
+    """Analyze the user's logs, reusing a cached result, and save the profile."""
+    watermark = await run_in_threadpool(analysis_watermark, db, user_id)
+    key = (user_id, analysis_request.days_back,
+           analysis_request.include_sensitive, watermark)
+
+    with analysis_cache_lock:
+        cached = analysis_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+            analysis_cache.move_to_end(key)
+        else:
+            cached = None
+
+    if cached:
+        analysis_result = cached[1]
+    else:
+        task = analysis_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                analyze_and_cache(key, user_id, analysis_request))
+            analysis_inflight[key] = task
+            task.add_done_callback(
+                lambda done: finish_inflight_analysis(key, done))
+        # The task belongs to no request, and shield() keeps any request
+        # that goes away, the one that started it included, from cancelling
+        # the run the others are waiting on
+        analysis_result = await asyncio.shield(task)
+
     # Update or create persona profile
+    await run_in_threadpool(save_persona_analysis, db, user_id, analysis_result)
+
+    return analysis_result
+
+
+async def analyze_and_cache(key: Tuple, user_id: int,
+                            analysis_request: PersonaAnalysisRequest) -> Dict[str, Any]:
+    """Run one shared analysis with its own session and cache the result.
+
+    Requests awaiting it may finish and close their sessions first, so it
+    can't borrow one of theirs.
+    """
+    db = SessionLocal()
+    try:
+        # Run AI analysis
+        analysis_result = await persona_analyzer.analyze_user_persona(
+            db=db,
+            user_id=user_id,
+            days_back=analysis_request.days_back,
+            include_sensitive=analysis_request.include_sensitive
+        )
+    finally:
+        db.close()
+
+    with analysis_cache_lock:
+        analysis_cache[key] = (time.monotonic(), analysis_result)
+        analysis_cache.move_to_end(key)
+        if len(analysis_cache) > ANALYSIS_CACHE_SIZE:
+            analysis_cache.popitem(last=False)
+
+    return analysis_result
+
+
+def finish_inflight_analysis(key: Tuple, task: "asyncio.Task[Dict[str, Any]]"):
+    """Forget a finished shared analysis."""
+    del analysis_inflight[key]
+    # Mark a failure retrieved: every waiter may have gone away already
+    if not task.cancelled():
+        task.exception()
+
+
+def create_analysis_job(db: Session, user_id: int) -> AnalysisJob:
+    """Record a pending background analysis for the user."""
+    job = AnalysisJob(user_id=user_id, status="pending")
+    db.add(job)
+    db.commit()
+    return job
+
+
+def finish_analysis_job(db: Session, job_id: int, status: str):
+    """Mark a background analysis completed or failed."""
+    db.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(
+        status=status, completed_at=datetime.now(timezone.utc)))
+    db.commit()
+
+
+async def run_analysis_job(job_id: int, user_id: int,
+                           analysis_request: PersonaAnalysisRequest):
+    """Run a background analysis with its own session; the request's is closed."""
+    db = SessionLocal()
+    try:
+        status = "completed"
+        try:
+            await run_persona_analysis(db, user_id, analysis_request)
+        except Exception:
+            logger.exception("Persona analysis job %s failed", job_id)
+            await run_in_threadpool(db.rollback)
+            status = "failed"
+        await run_in_threadpool(finish_analysis_job, db, job_id, status)
+    finally:
+        db.close()
+
+
+def save_persona_analysis(db: Session, user_id: int, analysis_result: dict):
+    """Store analysis results on the user's persona profile.
+
+    analyze_persona is async, so this blocking session work is run through
+    run_in_threadpool rather than on the event loop.
+    """
     profile = db.query(PersonaProfile).filter(
-        PersonaProfile.user_id == current_user.id
+        PersonaProfile.user_id == user_id
     ).first()
 
     if not profile:
-        profile = PersonaProfile(user_id=current_user.id)
+        profile = PersonaProfile(user_id=user_id)
         db.add(profile)
 
     # Update profile with analysis results
@@ -78,16 +316,6 @@ async def analyze_persona(
     profile.data_points_count = analysis_result["data_points_analyzed"]
 
     db.commit()
-    db.refresh(profile)
-
-    return PersonaAnalysisResponse(
-        persona_summary=analysis_result["persona_summary"],
-        top_topics=analysis_result["top_topics"],
-        personality_traits=analysis_result["personality_traits"],
-        emotional_tone=analysis_result["emotional_tone"],
-        insights=analysis_result["insights"],
-        data_points_analyzed=analysis_result["data_points_analyzed"]
-    )
 
 
 @router.put("/profile", response_model=PersonaProfileSchema)
@@ -97,32 +325,40 @@ def update_persona_profile(
     db: Session = Depends(get_db)
 ):
     """Update user's persona profile manually."""
-    profile = db.query(PersonaProfile).filter(
-        PersonaProfile.user_id == current_user.id
-    ).first()
+    # Update only provided fields, in one UPDATE ... RETURNING statement
+    update_data = profile_update.model_dump(exclude_unset=True)
+
+    if update_data:
+        profile = db.scalars(update(PersonaProfile).where(
+            PersonaProfile.user_id == current_user.id
+        ).values(**update_data).returning(PersonaProfile)).first()
+        db.commit()
+    else:
+        profile = db.query(PersonaProfile).filter(
+            PersonaProfile.user_id == current_user.id
+        ).first()
 
     if not profile:
         raise HTTPException(
             status_code=404, detail="Persona profile not found")
 
-    # Update only provided fields
-    update_data = profile_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(profile, field, value)
-
-    db.commit()
-    db.refresh(profile)
-
-    return profile
+    return profile_response(profile)
 
 
-@router.get("/insights")
+@router.get("/insights", response_model=dict)
 def get_persona_insights(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get quick persona insights without full analysis."""
-    profile = db.query(PersonaProfile).filter(
+    # Only the summary columns; interest_map and bias_score are never read
+    profile = db.query(
+        PersonaProfile.persona_summary,
+        PersonaProfile.top_topics,
+        PersonaProfile.personality_traits,
+        PersonaProfile.last_analysis,
+        PersonaProfile.data_points_count
+    ).filter(
         PersonaProfile.user_id == current_user.id
     ).first()
 
@@ -142,15 +378,13 @@ def get_persona_insights(
     }
 
 
-@router.delete("/profile")
+@router.delete("/profile", response_model=dict)
 def delete_persona_profile(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_active_user_with_profile),
     db: Session = Depends(get_db)
 ):
     """Delete user's persona profile."""
-    profile = db.query(PersonaProfile).filter(
-        PersonaProfile.user_id == current_user.id
-    ).first()
+    profile = current_user.persona_profile
 
     if profile:
         db.delete(profile)
@@ -159,15 +393,13 @@ def delete_persona_profile(
     return {"message": "Persona profile deleted successfully"}
 
 
-@router.get("/export")
+@router.get("/export", response_model=dict)
 def export_persona_data(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_active_user_with_profile),
     db: Session = Depends(get_db)
 ):
     """Export user's persona data as JSON."""
-    profile = db.query(PersonaProfile).filter(
-        PersonaProfile.user_id == current_user.id
-    ).first()
+    profile = current_user.persona_profile
 
     if not profile:
         return {"message": "No persona data to export"}
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from enum import Enum
 
 # User schemas
 
@@ -24,8 +25,7 @@ class User(UserBase):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Token schemas
 
@@ -71,8 +71,7 @@ class PersonaProfile(PersonaProfileBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Behavior log schemas
 
@@ -114,8 +113,7 @@ class BehaviorLog(BehaviorLogBase):
     is_sensitive: bool
     include_in_analysis: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Analysis schemas
 
@@ -133,6 +131,26 @@ class PersonaAnalysisResponse(BaseModel):
     insights: List[str]
     data_points_analyzed: int
 
+
+class AnalysisJob(BaseModel):
+    id: int
+    status: str  # "pending", "completed", "failed"
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PerceiverType(str, Enum):
+    ADVERTISER = "advertiser"
+    CONTENT_FEEDER = "content_feeder"
+    DATA_BROKER = "data_broker"
+    AI_SYSTEM = "ai_system"
+    RECRUITER = "recruiter"
+    ROMANTIC_PARTNER = "romantic_partner"
+    COLLEAGUE = "colleague"
+    FAMILY_MEMBER = "family_member"
+
 # Export schemas
 
 
@@ -9,6 +9,21 @@ import sys
 import sqlite3
 from pathlib import Path
 
+# Placeholder extension icon: a note followed by a reference SVG
+ICON_TEMPLATE = """# Placeholder - Replace with actual PNG icons
+# Size: {size}x{size}
+# Use the SVG below as reference:
+<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg">
+  <defs>
+    <linearGradient id="grad" x1="0%" y1="0%" x2="100%" y2="100%">
+      <stop offset="0%" style="stop-color:#667eea;stop-opacity:1" />
+      <stop offset="100%" style="stop-color:#764ba2;stop-opacity:1" />
+    </linearGradient>
+  </defs>
+  <rect width="{size}" height="{size}" rx="{radius}" fill="url(#grad)"/>
+  <text x="50%" y="50%" text-anchor="middle" dy="0.35em" fill="white" font-size="{font_size}" font-family="Arial">M</text>
+</svg>"""
+
 
 def create_database():
     """Create SQLite database and tables."""
@@ -39,6 +54,13 @@ def create_database():
     return True
 
 
+def _write_icon(size, icon_dir):
+    """Write the placeholder icon for one size."""
+    icon_content = ICON_TEMPLATE.format_map(
+        {"size": size, "radius": size // 8, "font_size": size // 2})
+    (icon_dir / f"icon{size}.png").write_bytes(icon_content.encode("utf-8"))
+
+
 def create_extension_icons():
     """Create placeholder icon files for the extension."""
     print("Creating extension icons...")
@@ -46,26 +68,14 @@ def create_extension_icons():
     icon_dir = Path("extension/icons")
     icon_dir.mkdir(exist_ok=True)
 
-    # Create simple SVG icons (placeholder)
+    # Create simple SVG icons (placeholder); sizes that already have an
+    # icon are left alone so re-running setup keeps real icons
     icon_sizes = [16, 32, 48, 128]
+    existing = set(os.listdir(icon_dir))
 
     for size in icon_sizes:
-        icon_content = f'''<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}" xmlns="http://www.w3.org/2000/svg">
-  <defs>
-    <linearGradient id="grad" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#667eea;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#764ba2;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  <rect width="{size}" height="{size}" rx="{size//8}" fill="url(#grad)"/>
-  <text x="50%" y="50%" text-anchor="middle" dy="0.35em" fill="white" font-size="{size//2}" font-family="Arial">M</text>
-</svg>'''
-
-        with open(f"extension/icons/icon{size}.png", "w", encoding='utf-8') as f:
-            f.write("# Placeholder - Replace with actual PNG icons\n")
-            f.write(f"# Size: {size}x{size}\n")
-            f.write("# Use the SVG below as reference:\n")
-            f.write(icon_content)
+        if f"icon{size}.png" not in existing:
+            _write_icon(size, icon_dir)
 
     print("Placeholder icons created!")
 
@@ -96,15 +106,23 @@ def install_dependencies():
     print("📦 Installing Python dependencies...")
 
     try:
+        import shutil
         import subprocess
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", "backend/requirements.txt"
-        ], capture_output=True, text=True)
+
+        # uv resolves and downloads in parallel; otherwise pip takes wheels
+        # over building sdists. Output streams so progress stays visible.
+        if shutil.which("uv"):
+            command = ["uv", "pip", "install", "--python", sys.executable]
+        else:
+            command = [sys.executable, "-m", "pip",
+                       "install", "--prefer-binary"]
+        result = subprocess.run(
+            command + ["-r", "backend/requirements.txt"])
 
         if result.returncode == 0:
             print("✅ Python dependencies installed successfully!")
         else:
-            print(f"❌ Failed to install dependencies: {result.stderr}")
+            print("❌ Failed to install dependencies (see output above)")
             return False
 
     except Exception as e: